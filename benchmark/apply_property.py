@@ -0,0 +1,50 @@
+# benchmark bulk edit of selected nodes against node count
+# usage: blender --background --factory-startup --python benchmark/apply_property.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')))
+
+import bpy
+import nPick
+from benchmark.common import add_picker_tree, timeit
+from nPick.production.batch import apply_property
+
+def set_per_node(nodes, name, value):
+    '''bulk edit before apply_property, every write runs update callbacks'''
+    for node in nodes:
+        if hasattr(node, name):
+            setattr(node, name, value)
+
+if __name__ == '__main__':
+    nPick.lazy_register = False
+    nPick.register()
+
+    print('%8s %14s %14s' % ('nodes', 'per node ms', 'batch ms'))
+    for node_count in (10, 100, 500):
+        node_tree = add_picker_tree()
+        nodes = []
+        for index_node in range(node_count):
+            node = node_tree.nodes.new('NodeNPickBonePicker')
+            for index_column in range(5):
+                picker_column = node.picker_columns.add()
+                for index_row in range(5):
+                    picker_column.rows.add()
+            nodes.append(node)
+
+        modes = ['SINGLE', 'MULTI']
+
+        def switch_per_node():
+            modes.reverse()
+            set_per_node(nodes, 'mode_select', modes[0])
+
+        def switch_batch():
+            modes.reverse()
+            apply_property(nodes, 'mode_select', modes[0])
+
+        print('%8d %14.3f %14.3f' % (node_count, timeit(switch_per_node, 10), timeit(switch_batch, 10)))
+
+        bpy.data.node_groups.remove(node_tree)
+
+    nPick.unregister()
@@ -0,0 +1,69 @@
+# helpers shared by benchmarks, run inside blender
+
+import time
+import bpy
+
+def add_armature(bone_count, name='benchmark'):
+    '''add armature object with bone_count bones in chains of 10, return object in pose mode'''
+    armature = bpy.data.armatures.new(name)
+    object_armature = bpy.data.objects.new(name, armature)
+    bpy.context.scene.collection.objects.link(object_armature)
+    bpy.context.view_layer.objects.active = object_armature
+
+    bpy.ops.object.mode_set(mode='EDIT')
+    parent = None
+    for index in range(bone_count):
+        if index % 10 == 0:
+            parent = None
+        side = '.L' if index % 2 else '.R'
+        edit_bone = armature.edit_bones.new('bone_%04d%s' % (index // 2, side))
+        edit_bone.head = ((0.1 if side == '.L' else -0.1) * (index % 20 + 1), index // 20, 0)
+        edit_bone.tail = edit_bone.head[0], edit_bone.head[1], 0.1
+        edit_bone.parent = parent
+        edit_bone.layers = [layer == index % 32 for layer in range(32)]
+        parent = edit_bone
+    bpy.ops.object.mode_set(mode='POSE')
+
+    return object_armature
+
+def remove_armature(object_armature):
+    armature = object_armature.data
+    bpy.data.objects.remove(object_armature)
+    bpy.data.armatures.remove(armature)
+
+def add_picker_tree(name='benchmark'):
+    return bpy.data.node_groups.new(name, 'nPicker')
+
+def timeit(function, repeat=100):
+    '''best time of function call in milliseconds'''
+    best = None
+    for index in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+class Layout:
+    '''stand in for UILayout in background mode, counts calls so draw code can be timed without UI'''
+
+    def __init__(self, operator_properties=None):
+        self.calls = 0
+
+        # rna struct returned by operator, None returns layout
+        self.operator_properties = operator_properties
+        self.scale_y = 1.0
+        self.alignment = 'EXPAND'
+        self.enabled = True
+        self.active = True
+
+    def _layout(self, *args, **kwargs):
+        self.calls += 1
+        return self
+
+    def operator(self, *args, **kwargs):
+        self.calls += 1
+        return self.operator_properties if self.operator_properties is not None else self
+
+    row = column = split = box = _layout
+    prop = prop_search = label = menu = _layout
@@ -0,0 +1,53 @@
+# benchmark keyframing selected bones against per bone keyframe_insert
+# usage: blender --background --factory-startup --python benchmark/keyframe.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')))
+
+import bpy
+import numpy
+import nPick
+from benchmark.common import add_armature, remove_armature, timeit
+from nPick.production.keyframe import key_bones
+
+def key_per_bone(object_armature, frame):
+    '''keyframe before batch keying, insert path of blender for every channel of every selected bone'''
+    for pose_bone in object_armature.pose.bones:
+        if pose_bone.bone.select:
+            pose_bone.keyframe_insert('location', frame=frame, group=pose_bone.name)
+            pose_bone.keyframe_insert('rotation_quaternion', frame=frame, group=pose_bone.name)
+            pose_bone.keyframe_insert('scale', frame=frame, group=pose_bone.name)
+
+if __name__ == '__main__':
+    nPick.lazy_register = False
+    nPick.register()
+
+    print('%8s %8s %14s %14s' % ('bones', 'keys', 'per bone ms', 'batch ms'))
+    for bone_count in (100, 500, 1000):
+        object_armature = add_armature(bone_count)
+        object_armature.data.bones.foreach_set('select', numpy.ones(bone_count, dtype=bool))
+        mask = numpy.ones(bone_count, dtype=bool)
+
+        # key a new frame on every call, both paths extend existing curves
+        frames = [0, 0]
+
+        def key_old():
+            frames[0] += 1
+            key_per_bone(object_armature, frames[0])
+
+        def key_batch():
+            frames[1] += 1
+            key_bones(object_armature, mask, frames[1])
+
+        old_ms = timeit(key_old, 10)
+        object_armature.animation_data_clear()
+        batch_ms = timeit(key_batch, 10)
+
+        print('%8d %8d %14.3f %14.3f' % (bone_count, bone_count * 10, old_ms, batch_ms))
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+        remove_armature(object_armature)
+
+    nPick.unregister()
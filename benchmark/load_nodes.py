@@ -0,0 +1,81 @@
+# benchmark npick.load_nodes on a 500 node picker file
+# usage: blender --background --factory-startup --python benchmark/load_nodes.py
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')))
+
+import bpy
+import nPick
+from nPick.core import save_format
+from nPick.production.editor_type_operator import load_nodes
+from benchmark.common import add_picker_tree
+
+def base_dict(node_type, index, parent):
+    return {
+        "type": node_type,
+        "label": "",
+        "location": [(index % 25) * 300.0, (index // 25) * -300.0],
+        "width": 250.0,
+        "height": 100.0,
+        "hide": False,
+        "parent": parent,
+        "use_custom_color": False,
+        "color": [0.6, 0.6, 0.6]
+    }
+
+def generate_nodes(node_count=500, frame_count=25, columns=5, rows=5):
+    '''yield (name, save dict) of frames and picker nodes parented to them'''
+    for index in range(frame_count):
+        save_dict = base_dict('NodeFrame', index, None)
+        save_dict.update(label_size=20, shrink=True)
+        yield 'Frame.%03d' % index, save_dict
+
+    for index in range(node_count - frame_count):
+        save_dict = base_dict('NodeNPickBonePicker', index, 'Frame.%03d' % (index % frame_count))
+        save_dict.update(
+            mode_compact=True,
+            mode_select='SINGLE',
+            picker_columns=[{'size': 1.0, 'rows': [{'bone_name': 'bone_%03d_%d_%d' % (index, column, row), 'show_bone_name': False} for row in range(rows)]} for column in range(columns)]
+        )
+        yield 'Picker.%03d' % index, save_dict
+
+def load_nodes_per_node(node_tree, file):
+    '''loader before bulk load, every node is loaded as it is created with update callbacks active'''
+    parent_nodes = {}
+    for node_name, node_data in save_format.read_nodes(file):
+        new_node = node_tree.nodes.new(node_data['type'])
+        parent_nodes[node_name] = {'node': new_node}
+        new_node.location = tuple(node_data['location'])
+        new_node.parent = parent_nodes[node_data['parent']]['node'] if node_data['parent'] else None
+        if hasattr(new_node, 'picker_columns'):
+            new_node.mode_compact = node_data['mode_compact']
+            new_node.mode_select = node_data['mode_select']
+            for col_data in node_data['picker_columns']:
+                new_col = new_node.picker_columns.add()
+                new_col.size = col_data['size']
+                for row_data in col_data['rows']:
+                    new_row = new_col.rows.add()
+                    new_row.bone_name = row_data['bone_name']
+                    new_row.show_bone_name = row_data['show_bone_name']
+
+if __name__ == '__main__':
+    nPick.lazy_register = False
+    nPick.register()
+
+    file = io.StringIO()
+    save_format.write_nodes(file, generate_nodes())
+    text = file.getvalue()
+    print('500 nodes, %.1f KiB' % (len(text) / 1024))
+
+    for label, loader in (('per node', load_nodes_per_node), ('bulk', load_nodes)):
+        node_tree = add_picker_tree(label)
+        start = time.perf_counter()
+        loader(node_tree, io.StringIO(text))
+        print('%-8s load %8.2f ms' % (label, (time.perf_counter() - start) * 1000))
+        bpy.data.node_groups.remove(node_tree)
+
+    nPick.unregister()
@@ -0,0 +1,58 @@
+# benchmark picker click latency against bone count
+# usage: blender --background --factory-startup --python benchmark/picker_click.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')))
+
+import bpy
+import nPick
+from benchmark.common import add_armature, remove_armature, add_picker_tree, timeit
+
+def click_per_bone(object_armature, bone_name):
+    '''picker click before selection index, deselect every bone'''
+    pose_bone = object_armature.pose.bones.get(bone_name)
+    for bone in [pose_bone_to_deselect.bone for pose_bone_to_deselect in object_armature.pose.bones if pose_bone_to_deselect is not pose_bone]:
+        bone.select = False
+    pose_bone.bone.select = True
+
+if __name__ == '__main__':
+    nPick.lazy_register = False
+    nPick.register()
+
+    node_tree = add_picker_tree()
+    node = node_tree.nodes.new('NodeNPickBonePicker')
+    column = node.picker_columns.add()
+    row_a = column.rows.add()
+    row_b = column.rows.add()
+
+    print('%8s %14s %14s' % ('bones', 'per bone ms', 'picker ms'))
+    for bone_count in (100, 500, 1000, 2000, 5000):
+        object_armature = add_armature(bone_count)
+        bone_names = [bone.name for bone in object_armature.data.bones]
+
+        node.object_armature = object_armature
+        node.mode_select = 'SINGLE'
+        for row, bone_name in ((row_a, bone_names[0]), (row_b, bone_names[-1])):
+            row.bone_name = bone_name
+
+        def click_picker():
+            node.click_row(bpy.context, row_a)
+            node.click_row(bpy.context, row_b)
+
+        def click_old():
+            click_per_bone(object_armature, bone_names[0])
+            click_per_bone(object_armature, bone_names[-1])
+
+        print('%8d %14.3f %14.3f' % (bone_count, timeit(click_old, 20) / 2, timeit(click_picker) / 2))
+
+        # picker writes select flags with foreach_set, evaluated armature must show the new selection
+        node.click_row(bpy.context, row_a)
+        bones = object_armature.evaluated_get(bpy.context.evaluated_depsgraph_get()).data.bones
+        assert bones[bone_names[0]].select and not bones[bone_names[-1]].select, 'evaluated armature shows old selection'
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+        remove_armature(object_armature)
+
+    nPick.unregister()
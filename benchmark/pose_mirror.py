@@ -0,0 +1,53 @@
+# benchmark mirror of selected bones against per bone python loop
+# usage: blender --background --factory-startup --python benchmark/pose_mirror.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')))
+
+import bpy
+import numpy
+import nPick
+from benchmark.common import add_armature, remove_armature, timeit
+from nPick.core.remap import mirror_name
+from nPick.production.pose import get_selected, mirror_pose
+
+def mirror_per_bone(object_armature):
+    '''mirror script before pair table, opposite bone is looked up by name for every selected bone'''
+    pose_bones = object_armature.pose.bones
+    values = {}
+    for pose_bone in pose_bones:
+        if pose_bone.bone.select:
+            x, y, z = pose_bone.location
+            w, qx, qy, qz = pose_bone.rotation_quaternion
+            values[mirror_name(pose_bone.name)] = ((-x, y, z), (w, qx, -qy, -qz), tuple(pose_bone.scale))
+    for name, (location, rotation_quaternion, scale) in values.items():
+        pose_bone = pose_bones.get(name)
+        if pose_bone:
+            pose_bone.location = location
+            pose_bone.rotation_quaternion = rotation_quaternion
+            pose_bone.scale = scale
+
+if __name__ == '__main__':
+    nPick.lazy_register = False
+    nPick.register()
+
+    print('%8s %14s %14s' % ('bones', 'per bone ms', 'pair table ms'))
+    for bone_count in (500, 2000, 5000):
+        object_armature = add_armature(bone_count)
+        object_armature.data.bones.foreach_set('select', numpy.ones(bone_count, dtype=bool))
+
+        def mirror_old():
+            mirror_per_bone(object_armature)
+
+        def mirror_new():
+            pose_cache, mask = get_selected(object_armature)
+            mirror_pose(object_armature, mask, pose_cache.get_pairs())
+
+        print('%8d %14.3f %14.3f' % (bone_count, timeit(mirror_old, 10), timeit(mirror_new, 10)))
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+        remove_armature(object_armature)
+
+    nPick.unregister()
@@ -0,0 +1,52 @@
+# benchmark pose snapshot restore against per bone python loop
+# usage: blender --background --factory-startup --python benchmark/pose_snapshot.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')))
+
+import bpy
+import nPick
+from benchmark.common import add_armature, remove_armature, timeit
+from nPick.production.pose import read_pose
+from nPick.production.node_pose_snapshot import apply_snapshot, blend_snapshots
+
+def store_per_bone(object_armature):
+    '''snapshot before pose snapshot node, transforms copied bone by bone'''
+    return {pose_bone.name: (tuple(pose_bone.location), tuple(pose_bone.rotation_quaternion), tuple(pose_bone.rotation_euler), tuple(pose_bone.scale)) for pose_bone in object_armature.pose.bones}
+
+def restore_per_bone(object_armature, snapshot):
+    for pose_bone in object_armature.pose.bones:
+        location, rotation_quaternion, rotation_euler, scale = snapshot[pose_bone.name]
+        pose_bone.location = location
+        pose_bone.rotation_quaternion = rotation_quaternion
+        pose_bone.rotation_euler = rotation_euler
+        pose_bone.scale = scale
+
+if __name__ == '__main__':
+    nPick.lazy_register = False
+    nPick.register()
+
+    print('%8s %14s %14s %14s' % ('bones', 'per bone ms', 'snapshot ms', 'blend ms'))
+    for bone_count in (500, 2000, 5000):
+        object_armature = add_armature(bone_count)
+        bone_names = [pose_bone.name for pose_bone in object_armature.pose.bones]
+        snapshot_per_bone = store_per_bone(object_armature)
+        snapshot = (bone_names, read_pose(object_armature))
+
+        def restore_old():
+            restore_per_bone(object_armature, snapshot_per_bone)
+
+        def restore_snapshot():
+            apply_snapshot(object_armature, *snapshot)
+
+        def blend():
+            apply_snapshot(object_armature, *blend_snapshots(snapshot, snapshot, 0.5))
+
+        print('%8d %14.3f %14.3f %14.3f' % (bone_count, timeit(restore_old, 10), timeit(restore_snapshot, 10), timeit(blend, 10)))
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+        remove_armature(object_armature)
+
+    nPick.unregister()
@@ -0,0 +1,64 @@
+# benchmark python time of picker node draw_buttons
+# usage: blender --background --factory-startup --python benchmark/redraw.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')))
+
+import bpy
+import nPick
+from benchmark.common import add_picker_tree, timeit, Layout
+
+def draw_buttons_uncached(node, layout):
+    '''picker grid draw before draw model, original row.prop button, stand in layout does not resolve the removed picker property'''
+    col = layout.column()
+    for index, picker_column in enumerate(node.picker_columns):
+        if picker_column.rows:
+            row = col.row()
+            row.scale_y = picker_column.size
+            for picker_row in picker_column.rows:
+                row.prop(picker_row, 'picker', text=picker_row.bone_name if bool(picker_row.bone_name) and picker_row.show_bone_name else ' ', expand=True, toggle=True, emboss=bool(picker_row.bone_name))
+
+class BenchmarkOperatorProperties(bpy.types.PropertyGroup):
+    '''stand in for properties of npick.click_row_picker'''
+    row_address: bpy.props.StringProperty(default='')
+
+if __name__ == '__main__':
+    nPick.lazy_register = False
+    nPick.register()
+
+    node_tree = add_picker_tree()
+    nodes = []
+    for index_node in range(20):
+        node = node_tree.nodes.new('NodeNPickBonePicker')
+        node.mode_compact = True
+        for index_column in range(10):
+            picker_column = node.picker_columns.add()
+            for index_row in range(10):
+                picker_row = picker_column.rows.add()
+                picker_row.bone_name = 'bone_%d_%d' % (index_column, index_row) if index_row % 3 else ''
+                picker_row.show_bone_name = bool(index_row % 2)
+        nodes.append(node)
+
+    # operator property writes of cached draw go to an rna struct like real operator properties
+    bpy.utils.register_class(BenchmarkOperatorProperties)
+    bpy.types.Scene.npick_benchmark = bpy.props.PointerProperty(type=BenchmarkOperatorProperties)
+    layout = Layout(bpy.context.scene.npick_benchmark)
+    context = bpy.context
+
+    def draw_uncached():
+        for node in nodes:
+            draw_buttons_uncached(node, layout)
+
+    def draw_cached():
+        for node in nodes:
+            node.draw_buttons(context, layout)
+
+    print('20 picker nodes, 100 buttons each')
+    print('uncached draw %.3f ms' % timeit(draw_uncached))
+    print('cached draw   %.3f ms' % timeit(draw_cached))
+
+    del bpy.types.Scene.npick_benchmark
+    bpy.utils.unregister_class(BenchmarkOperatorProperties)
+    nPick.unregister()
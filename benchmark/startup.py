@@ -0,0 +1,46 @@
+# benchmark enabling nPick with lazy or eager register, run each mode in its own process
+# usage: blender --background --factory-startup --python benchmark/startup.py -- [lazy|eager]
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')))
+
+import nPick
+
+def resident_memory():
+    '''current resident memory in KiB, None when not available on this platform'''
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+if __name__ == '__main__':
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    nPick.lazy_register = 'eager' not in argv
+    mode = 'lazy' if nPick.lazy_register else 'eager'
+
+    resident_before = resident_memory()
+    tracemalloc.start()
+    start = time.perf_counter()
+    nPick.register()
+    elapsed = (time.perf_counter() - start) * 1000
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resident_after = resident_memory()
+
+    print(nPick.startup_report())
+    print('%s register %.2f ms, python memory %.1f KiB (peak %.1f KiB)' % (mode, elapsed, current / 1024, peak / 1024))
+    if resident_before is not None:
+        print('%s resident memory +%d KiB' % (mode, resident_after - resident_before))
+
+    if nPick.lazy_register:
+        # cost paid on first use of nPicker tree
+        start = time.perf_counter()
+        nPick.register_lazy_modules()
+        print('lazy first use %.2f ms' % ((time.perf_counter() - start) * 1000))
+
+    nPick.unregister()
@@ -26,33 +26,163 @@ bl_info = {
     "category" : "Node"
 }
 
+
 import os
+import time
 import importlib
 
+# submodules to register on addon enable, in order
+module_names = [
+    'production.preferences',
+    'production.editor_type'
+]
+
+# submodules to register on first use of nPicker tree when lazy register is enabled
+lazy_module_names = [
+    'core.save_format',
+    'core.model',
+    'core.remap',
+    'core.generate',
+    'production.updates',
+    'production.redraw',
+    'production.armature_cache',
+    'production.selection',
+    'production.draw_cache',
+    'production.batch',
+    'production.selection_set',
+    'production.keyframe',
+    'production.pose',
+    'production.editor_type_operator',
+    'production.node',
+    'production.node_bone_picker',
+    'production.node_object_layer',
+    'production.node_object_custom_properties',
+    'production.node_object_custom_properties_data',
+    'production.node_bone_custom_properties_bone',
+    'production.node_bone_custom_properties_pose_bone',
+    'production.node_pose_snapshot',
+    'production.migrate',
+    'production.editor_type_panel'
+]
+
+# budget in milliseconds for enabling the addon, report is printed when exceeded
+startup_budget = 50.0
+
+# default when addon preferences are not available, e.g. register called from script
+lazy_register = True
+
+if 'modules' in locals():
+    # script reload, re-execute submodules on next register
+    is_reload = True
+else:
+    is_reload = False
+
+    # module objects imported by register, kept for unregister
+    modules = []
+
+    # (module name, import ms, register ms) from last register
+    startup_timings = []
+
+    # (module name, import ms, register ms) from last lazy register
+    lazy_timings = []
+
+def import_module(name):
+    '''import submodule once under package name'''
+    module = importlib.import_module('.' + name, __name__)
+
+    if is_reload:
+        module = importlib.reload(module)
+
+    return module
+
+def startup_time():
+    '''total milliseconds spent on last register'''
+    return sum(import_ms + register_ms for name, import_ms, register_ms in startup_timings)
+
+def startup_report():
+    '''generate text report of last register timings'''
+    lines = ['nPick startup %.2f ms (budget %.2f ms)' % (startup_time(), startup_budget)]
+
+    for name, import_ms, register_ms in startup_timings:
+        lines.append('  %-56s import %7.2f ms, register %7.2f ms' % (name, import_ms, register_ms))
+
+    if lazy_timings:
+        lines.append('nPick lazy register %.2f ms' % sum(import_ms + register_ms for name, import_ms, register_ms in lazy_timings))
+
+        for name, import_ms, register_ms in lazy_timings:
+            lines.append('  %-56s import %7.2f ms, register %7.2f ms' % (name, import_ms, register_ms))
+
+    return '\n'.join(lines)
+
+def register_modules(names, timings):
+    '''import and register modules, append timings'''
+    for name in names:
+        start = time.perf_counter()
+        module = import_module(name)
+        imported = time.perf_counter()
+
+        if callable(getattr(module, 'register', None)):
+            module.register()
+
+        modules.append(module)
+        timings.append((module.__name__, (imported - start) * 1000, (time.perf_counter() - imported) * 1000))
+
+def is_lazy_register():
+    '''lazy register from addon preferences, fallback to module default'''
+    import bpy
+    from .production.preferences import get_preferences
+
+    preferences = get_preferences(bpy.context)
+    return preferences.lazy_register if preferences else lazy_register
+
+def is_lazy_registered():
+    '''lazy modules already registered'''
+    return len(modules) > len(module_names)
+
+def register_lazy_modules():
+    '''register modules deferred by lazy register, does nothing when already registered'''
+    global is_reload
+
+    if is_lazy_registered():
+        return
+
+    lazy_timings.clear()
+    register_modules(lazy_module_names, lazy_timings)
+    is_reload = False
+
+    # remove stubs
+    for module in modules:
+        if callable(getattr(module, 'unregister_stub', None)):
+            module.unregister_stub()
+
+    if os.environ.get('NPICK_STARTUP_REPORT'):
+        print(startup_report())
+
 def register():
-    for dirname, subdirs, files in os.walk(os.path.dirname(os.path.realpath(__file__))):
-        if '__pycache__' in subdirs:
-            subdirs.remove('__pycache__')
-
-        for filename in files:
-            if filename.endswith('.py') and filename != "__init__.py":
-                spec = importlib.util.spec_from_file_location('dummy_module', os.path.join(dirname, filename))
-                foo = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(foo)
-                is_module_has_register_attr = getattr(foo, "register", None)
-                if is_module_has_register_attr is not None and callable(is_module_has_register_attr):
-                    foo.register()
+    global is_reload
+
+    modules.clear()
+    startup_timings.clear()
+    lazy_timings.clear()
+
+    register_modules(module_names, startup_timings)
+
+    if is_lazy_register():
+        # stubs register everything on first use of nPicker tree
+        for module in modules:
+            if callable(getattr(module, 'register_stub', None)):
+                module.register_stub()
+    else:
+        register_modules(lazy_module_names, startup_timings)
+        is_reload = False
+
+    # report when over budget or when asked with environment variable
+    if startup_time() > startup_budget or os.environ.get('NPICK_STARTUP_REPORT'):
+        print(startup_report())
 
 def unregister():
-    for dirname, subdirs, files in os.walk(os.path.dirname(os.path.realpath(__file__))):
-        if '__pycache__' in subdirs:
-            subdirs.remove('__pycache__')
-
-        for filename in files:
-            if filename.endswith('.py') and filename != "__init__.py":
-                spec = importlib.util.spec_from_file_location('dummy_module', os.path.join(dirname, filename))
-                foo = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(foo)
-                is_module_has_unregister_attr = getattr(foo, "unregister", None)
-                if is_module_has_unregister_attr is not None and callable(is_module_has_unregister_attr):
-                    foo.unregister()
\ No newline at end of file
+    for module in reversed(modules):
+        if callable(getattr(module, 'unregister', None)):
+            module.unregister()
+
+    modules.clear()
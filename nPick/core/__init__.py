@@ -0,0 +1 @@
+# bpy free model of picker layouts, save/load and validation run in plain python
@@ -0,0 +1,179 @@
+# batch convert picker files without blender
+#
+# python -m nPick.core.convert pickers/ --remap DEF-spine=CTRL-spine --upgrade --jobs 8
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import functools
+import multiprocessing
+from . import model, save_format, remap as remap_rules
+
+# file extensions of picker files
+extensions = ('.npick', '.json')
+
+def find_files(paths):
+    '''yield (root, picker file) in paths, directories are walked, root is kept for output path'''
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            for dirname, subdirs, files in os.walk(path):
+                subdirs.sort()
+                for filename in sorted(files):
+                    if filename.endswith(extensions):
+                        yield path, os.path.join(dirname, filename)
+        else:
+            yield os.path.dirname(path), path
+
+def read_remap_file(filepath):
+    '''read "old=new" lines, empty lines and lines starting with # are skipped'''
+    remap = {}
+    with open(filepath, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                old_name, new_name = line.split('=', 1)
+                remap[old_name.strip()] = new_name.strip()
+    return remap
+
+def transform(tree, options):
+    '''apply options to tree, return True when tree changed'''
+    changed = False
+
+    if options['remap']:
+        remap = options['remap']
+        changed |= model.rename_bones(tree, lambda name: remap.get(name, name)) > 0
+
+    if options['rules']:
+        rule_set = remap_rules.RuleSet.parse(options['rules'])
+        changed |= model.rename_bones(tree, rule_set.apply) > 0
+
+    if options['column_size'] is not None:
+        for node in tree.nodes:
+            if isinstance(node, model.PickerNode):
+                for column in node.columns:
+                    if column.size != options['column_size']:
+                        column.size = options['column_size']
+                        changed = True
+
+    if options['upgrade'] and tree.version != save_format.VERSION:
+        tree.version = list(save_format.VERSION)
+        changed = True
+
+    return changed
+
+def write_atomic(filepath, tree):
+    '''write tree to temporary file next to filepath then replace filepath'''
+    dirname = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(dirname, exist_ok=True)
+    descriptor, temp_filepath = tempfile.mkstemp(prefix='.npick-', dir=dirname)
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            model.write_tree(tree, file)
+
+        # mkstemp creates 0600 files, keep mode of replaced file or use default mode of new files
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, temp_filepath)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_filepath, 0o666 & ~umask)
+
+        os.replace(temp_filepath, filepath)
+    except BaseException:
+        os.remove(temp_filepath)
+        raise
+
+def convert_file(item, options):
+    '''convert one (root, file), return (filepath, status, byte size, error)'''
+    root, filepath = item
+    try:
+        size = os.path.getsize(filepath)
+
+        with open(filepath, 'r', encoding='utf-8') as file:
+            tree = model.read_tree(file)
+
+        changed = transform(tree, options)
+
+        output_filepath = filepath
+        if options['output']:
+            output_filepath = os.path.join(options['output'], os.path.relpath(filepath, root))
+
+        if changed:
+            if not options['dry_run']:
+                write_atomic(output_filepath, tree)
+            return filepath, 'changed', size, None
+
+        if output_filepath != filepath and not options['dry_run']:
+            # unchanged file is copied byte for byte
+            with open(filepath, 'rb') as file:
+                data = file.read()
+            os.makedirs(os.path.dirname(os.path.abspath(output_filepath)), exist_ok=True)
+            with open(output_filepath, 'wb') as file:
+                file.write(data)
+
+        return filepath, 'unchanged', size, None
+    except Exception as error:
+        return filepath, 'error', 0, '%s: %s' % (type(error).__name__, error)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m nPick.core.convert', description='batch convert nPick picker files')
+    parser.add_argument('paths', nargs='+', help='picker files or directories')
+    parser.add_argument('--remap', action='append', default=[], metavar='OLD=NEW', help='rename bone, can be repeated')
+    parser.add_argument('--remap-file', help='file with OLD=NEW lines')
+    parser.add_argument('--rules', help='rule set file, "pattern => replacement" or "mirror" per line')
+    parser.add_argument('--column-size', type=float, help='set size of every picker column')
+    parser.add_argument('--upgrade', action='store_true', help='upgrade files to version ' + '.'.join(str(x) for x in save_format.VERSION))
+    parser.add_argument('--output', help='write to directory instead of in place')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('--dry-run', action='store_true', help='report without writing')
+    args = parser.parse_args(argv)
+
+    remap = dict(item.split('=', 1) for item in args.remap)
+    if args.remap_file:
+        remap.update(read_remap_file(args.remap_file))
+
+    rules = None
+    if args.rules:
+        with open(args.rules, 'r', encoding='utf-8') as file:
+            rules = file.read()
+        # fail early on bad rule
+        remap_rules.RuleSet.parse(rules)
+
+    items = list(find_files(args.paths))
+    options = {
+        'remap': remap,
+        'rules': rules,
+        'column_size': args.column_size,
+        'upgrade': args.upgrade,
+        'output': args.output,
+        'dry_run': args.dry_run
+    }
+
+    counts = {'changed': 0, 'unchanged': 0, 'error': 0}
+    errors = []
+    total_size = 0
+    start = time.perf_counter()
+
+    with multiprocessing.Pool(max(1, args.jobs)) as pool:
+        for filepath, status, size, error in pool.imap_unordered(functools.partial(convert_file, options=options), items, chunksize=8):
+            counts[status] += 1
+            total_size += size
+            if error:
+                errors.append((filepath, error))
+
+    elapsed = time.perf_counter() - start
+
+    for filepath, error in sorted(errors):
+        print('error %s: %s' % (filepath, error), file=sys.stderr)
+
+    print('%d files, %d changed, %d unchanged, %d errors' % (len(items), counts['changed'], counts['unchanged'], counts['error']))
+    print('%.2f s, %.1f files/s, %.2f MiB/s' % (elapsed, len(items) / elapsed if elapsed else 0, total_size / 1048576 / elapsed if elapsed else 0))
+
+    return 1 if errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
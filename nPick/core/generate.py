@@ -0,0 +1,50 @@
+# lay out picker node models for groups of bones
+
+from . import model
+
+def group_by_layer(names, layers):
+    '''[(label, names)] of 32 layers, layers is per bone sequence of 32 booleans, bone can be in many layers'''
+    groups = [('Layer ' + str(index + 1), []) for index in range(32)]
+    for name, bone_layers in zip(names, layers):
+        for index, is_in_layer in enumerate(bone_layers):
+            if is_in_layer:
+                groups[index][1].append(name)
+    return [group for group in groups if group[1]]
+
+def group_by_key(names, keys, default_label):
+    '''[(label, names)] grouped by key of each bone in first seen order, bones without key go to default_label'''
+    groups = {}
+    for name, key in zip(names, keys):
+        groups.setdefault(key if key else default_label, []).append(name)
+    return list(groups.items())
+
+def get_depths(names, parents):
+    '''hierarchy depth of each bone, parents is parent name or None per bone, parents are listed before children'''
+    depths = {}
+    for name, parent in zip(names, parents):
+        depths[name] = depths[parent] + 1 if parent in depths else 0
+    return [depths[name] for name in names]
+
+def layout_pickers(groups, buttons_per_column=8, nodes_per_row=4, width=250.0, spacing=40.0, button_height=22.0, show_bone_name=True, mode_compact=True):
+    '''create picker node models for [(label, names)] placed in a grid, top left at (0, 0)'''
+    node_models = []
+    row_height = 0.0
+    y = 0.0
+
+    for index, (label, names) in enumerate(groups):
+        if index and index % nodes_per_row == 0:
+            # next row of nodes
+            y -= row_height + spacing
+            row_height = 0.0
+
+        node_model = model.PickerNode('Picker', 'NodeNPickBonePicker', label, ((index % nodes_per_row) * (width + spacing), y), width)
+        node_model.mode_compact = mode_compact
+        node_model.columns = [
+            model.PickerColumn(1.0, [model.PickerRow(name, show_bone_name) for name in names[start:start + buttons_per_column]])
+            for start in range(0, len(names), buttons_per_column)
+        ]
+        node_model.height = len(node_model.columns) * button_height + 40.0
+        row_height = max(row_height, node_model.height)
+        node_models.append(node_model)
+
+    return node_models
@@ -0,0 +1,283 @@
+# picker layout model, serialised to and from the dict format of Node.save()
+
+from . import save_format
+
+# picker row kinds
+BONE = 'BONE'
+SELECTION_SET = 'SELECTION_SET'
+KEY_SELECTION = 'KEY_SELECTION'
+
+class PickerRow:
+    '''button of picker, selects bone_name or applies selection set of node tree'''
+    __slots__ = ('bone_name', 'show_bone_name', 'kind', 'selection_set', 'selection_mode')
+
+    def __init__(self, bone_name='', show_bone_name=False, kind=BONE, selection_set='', selection_mode='SET'):
+        self.bone_name = bone_name
+        self.show_bone_name = show_bone_name
+        self.kind = kind
+        self.selection_set = selection_set
+        self.selection_mode = selection_mode
+
+    def to_dict(self):
+        data = {'bone_name': self.bone_name, 'show_bone_name': self.show_bone_name}
+
+        # bone rows keep the format of older versions
+        if self.kind != BONE:
+            data.update(kind=self.kind, selection_set=self.selection_set, selection_mode=self.selection_mode)
+
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['bone_name'], data['show_bone_name'], data.get('kind', BONE), data.get('selection_set', ''), data.get('selection_mode', 'SET'))
+
+class PickerColumn:
+    __slots__ = ('size', 'rows')
+
+    def __init__(self, size=1.0, rows=None):
+        self.size = size
+        self.rows = rows if rows is not None else []
+
+    def to_dict(self):
+        return {'size': self.size, 'rows': [row.to_dict() for row in self.rows]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['size'], [PickerRow.from_dict(row) for row in data['rows']])
+
+class Node:
+    '''base node, keys not known by the model are kept in extra and written back unchanged'''
+    __slots__ = ('name', 'type', 'label', 'location', 'width', 'height', 'hide', 'parent', 'use_custom_color', 'color', 'extra')
+
+    # keys written after base keys, in order
+    keys = ()
+
+    def __init__(self, name, type, label='', location=(0.0, 0.0), width=250.0, height=100.0, hide=False, parent=None, use_custom_color=False, color=(0.608, 0.608, 0.608), extra=None):
+        self.name = name
+        self.type = type
+        self.label = label
+        self.location = list(location)
+        self.width = width
+        self.height = height
+        self.hide = hide
+        self.parent = parent
+        self.use_custom_color = use_custom_color
+        self.color = list(color)
+        self.extra = extra if extra is not None else {}
+
+    def to_dict(self):
+        '''generate save dict in the same key order as Node.save()'''
+        data = {
+            "type": self.type,
+            "label": self.label,
+            "location": list(self.location),
+            "width": self.width,
+            "height": self.height,
+            "hide": self.hide,
+            "parent": self.parent,
+            "use_custom_color": self.use_custom_color,
+            "color": list(self.color),
+        }
+        for key in self.keys:
+            data[key] = self.get_value(key)
+        data.update(self.extra)
+        return data
+
+    def get_value(self, key):
+        return getattr(self, key)
+
+    def set_value(self, key, value):
+        setattr(self, key, value)
+
+    @classmethod
+    def from_dict(cls, name, data):
+        node = cls(name, data['type'], data['label'], data['location'], data['width'], data['height'], data['hide'], data['parent'], data['use_custom_color'], data['color'])
+        base_keys = ('type', 'label', 'location', 'width', 'height', 'hide', 'parent', 'use_custom_color', 'color')
+        for key, value in data.items():
+            if key in cls.keys:
+                node.set_value(key, value)
+            elif key not in base_keys:
+                node.extra[key] = value
+        return node
+
+class FrameNode(Node):
+    __slots__ = ('label_size', 'shrink')
+
+    keys = ('label_size', 'shrink')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.label_size = 20
+        self.shrink = True
+
+class PickerNode(Node):
+    __slots__ = ('mode_compact', 'mode_select', 'columns')
+
+    keys = ('mode_compact', 'mode_select', 'picker_columns')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mode_compact = False
+        self.mode_select = 'SINGLE'
+        self.columns = []
+
+    def get_value(self, key):
+        if key == 'picker_columns':
+            return [column.to_dict() for column in self.columns]
+        return super().get_value(key)
+
+    def set_value(self, key, value):
+        if key == 'picker_columns':
+            self.columns = [PickerColumn.from_dict(column) for column in value]
+        else:
+            super().set_value(key, value)
+
+    def iter_rows(self):
+        '''yield (column index, row index, row)'''
+        for index_column, column in enumerate(self.columns):
+            for index_row, row in enumerate(column.rows):
+                yield index_column, index_row, row
+
+class LayerNode(Node):
+    __slots__ = ('mode_compact', 'layer_with_bone', 'layer_names')
+
+    keys = ('mode_compact', 'layer_with_bone', 'collection_bone_layers')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mode_compact = False
+        self.layer_with_bone = False
+        self.layer_names = ['Layer ' + str(index + 1) for index in range(32)]
+
+    def get_value(self, key):
+        if key == 'collection_bone_layers':
+            return list(self.layer_names)
+        return super().get_value(key)
+
+    def set_value(self, key, value):
+        if key == 'collection_bone_layers':
+            self.layer_names = list(value)
+        else:
+            super().set_value(key, value)
+
+class CustomPropertiesNode(Node):
+    __slots__ = ('mode_compact',)
+
+    keys = ('mode_compact',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mode_compact = False
+
+class BoneCustomPropertiesNode(CustomPropertiesNode):
+    __slots__ = ('bone_name',)
+
+    keys = ('mode_compact', 'bone_name')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bone_name = ''
+
+class PoseSnapshotNode(Node):
+    __slots__ = ('mode_compact', 'source', 'picker_name', 'snapshot_a', 'snapshot_b', 'factor')
+
+    keys = ('mode_compact', 'source', 'picker_name', 'snapshot_a', 'snapshot_b', 'factor')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mode_compact = False
+        self.source = 'ALL'
+        self.picker_name = ''
+        self.snapshot_a = ''
+        self.snapshot_b = ''
+        self.factor = 0.0
+
+# node bl_idname to model class
+node_types = {
+    'NodeFrame': FrameNode,
+    'NodeNPickBonePicker': PickerNode,
+    'NodeNPickObjectLayer': LayerNode,
+    'NodeNPickObjectCustomProperties': CustomPropertiesNode,
+    'NodeNPickObjectCustomPropertiesData': CustomPropertiesNode,
+    'NodeNPickBoneCustomPropertiesBone': BoneCustomPropertiesNode,
+    'NodeNPickBoneCustomPropertiesPoseBone': BoneCustomPropertiesNode,
+    'NodeNPickPoseSnapshot': PoseSnapshotNode
+}
+
+def node_from_dict(name, data):
+    '''create model of save dict, unknown node type is kept as base node'''
+    return node_types.get(data['type'], Node).from_dict(name, data)
+
+class Tree:
+    __slots__ = ('version', 'nodes')
+
+    def __init__(self, version=None, nodes=None):
+        self.version = list(version) if version is not None else list(save_format.VERSION)
+        self.nodes = nodes if nodes is not None else []
+
+    def get(self, name):
+        return next((node for node in self.nodes if node.name == name), None)
+
+    def iter_bone_names(self):
+        '''yield (node, bone name) of every bone referenced by the tree'''
+        for node in self.nodes:
+            if isinstance(node, PickerNode):
+                for index_column, index_row, row in node.iter_rows():
+                    if row.bone_name:
+                        yield node, row.bone_name
+            elif isinstance(node, BoneCustomPropertiesNode) and node.bone_name:
+                yield node, node.bone_name
+
+    def iter_save_nodes(self):
+        for node in self.nodes:
+            yield node.name, node.to_dict()
+
+    @classmethod
+    def from_save_nodes(cls, version, save_nodes):
+        return cls(version, [node_from_dict(name, data) for name, data in save_nodes])
+
+def rename_bones(tree, rename):
+    '''apply rename(bone name) -> new bone name to every bone reference, return number of names changed'''
+    changed = 0
+
+    for node in tree.nodes:
+        if isinstance(node, PickerNode):
+            for index_column, index_row, row in node.iter_rows():
+                if row.bone_name:
+                    new_name = rename(row.bone_name)
+                    if new_name != row.bone_name:
+                        row.bone_name = new_name
+                        changed += 1
+        elif isinstance(node, BoneCustomPropertiesNode) and node.bone_name:
+            new_name = rename(node.bone_name)
+            if new_name != node.bone_name:
+                node.bone_name = new_name
+                changed += 1
+
+    return changed
+
+def read_tree(file):
+    '''read tree from line delimited or legacy json file'''
+    version, save_nodes = save_format.read_header(file)
+    return Tree.from_save_nodes(version, save_nodes)
+
+def write_tree(tree, file):
+    '''write tree in line delimited format, legacy version is written as legacy indented json'''
+    if tree.version == save_format.LEGACY_VERSION:
+        save_format.write_legacy(file, tree.iter_save_nodes())
+    else:
+        save_format.write_nodes(file, tree.iter_save_nodes(), tree.version)
+
+def validate(tree, bone_names):
+    '''return [(node name, bone name)] of bones referenced by tree that are not in bone_names'''
+    bone_names = set(bone_names)
+    return [(node.name, bone_name) for node, bone_name in tree.iter_bone_names() if bone_name not in bone_names]
+
+def diff(tree_a, tree_b):
+    '''return (added, removed, changed) node names from tree_a to tree_b'''
+    nodes_a = {node.name: node.to_dict() for node in tree_a.nodes}
+    nodes_b = {node.name: node.to_dict() for node in tree_b.nodes}
+    added = [name for name in nodes_b if name not in nodes_a]
+    removed = [name for name in nodes_a if name not in nodes_b]
+    changed = [name for name in nodes_a if name in nodes_b and nodes_a[name] != nodes_b[name]]
+    return added, removed, changed
@@ -0,0 +1,114 @@
+# bone name rule sets for retargeting pickers between rigs with different naming
+#
+# rule set text, one rule per line, applied in order:
+#   # comment
+#   ^DEF- => CTRL-          regex pattern => replacement
+#   mirror                  swap side of name, .L <-> .R, _l <-> _r, Left <-> Right
+
+import re
+
+# (regex, replacement function) for side markers, first match wins
+side_patterns = [
+    (re.compile(r'([._\-\s])([LlRr])(?=$|[._\-\s\d])'), lambda match: match.group(1) + {'L': 'R', 'R': 'L', 'l': 'r', 'r': 'l'}[match.group(2)]),
+    (re.compile(r'^([LlRr])(?=[._\-\s])'), lambda match: {'L': 'R', 'R': 'L', 'l': 'r', 'r': 'l'}[match.group(1)]),
+    (re.compile(r'(Left|Right|left|right|LEFT|RIGHT)'), lambda match: {'Left': 'Right', 'Right': 'Left', 'left': 'right', 'right': 'left', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}[match.group(1)])
+]
+
+def mirror_name(name):
+    '''name of the opposite side, same name when it has no side marker'''
+    for pattern, replace in side_patterns:
+        # replace last side marker only, e.g. hand.L.001
+        matches = list(pattern.finditer(name))
+        if matches:
+            match = matches[-1]
+            return name[:match.start()] + replace(match) + name[match.end():]
+    return name
+
+def name_side(name):
+    '''L or R from last side marker of name, None when it has no side marker'''
+    for pattern, replace in side_patterns:
+        matches = list(pattern.finditer(name))
+        if matches:
+            match = matches[-1]
+            return 'L' if match.group(match.lastindex)[0] in 'Ll' else 'R'
+    return None
+
+class Rule:
+    __slots__ = ('kind', 'pattern', 'replacement')
+
+    def __init__(self, kind, pattern=None, replacement=''):
+        self.kind = kind
+        self.pattern = re.compile(pattern) if pattern is not None else None
+        self.replacement = replacement
+
+    def apply(self, name):
+        if self.kind == 'MIRROR':
+            return mirror_name(name)
+        return self.pattern.sub(self.replacement, name)
+
+class RuleSet:
+    __slots__ = ('rules',)
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else []
+
+    def apply(self, name):
+        for rule in self.rules:
+            name = rule.apply(name)
+        return name
+
+    @classmethod
+    def parse(cls, text):
+        '''parse rule set text, raise ValueError with line number on bad rule'''
+        rules = []
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.lower() == 'mirror':
+                rules.append(Rule('MIRROR'))
+            elif '=>' in line:
+                pattern, replacement = line.split('=>', 1)
+                try:
+                    rules.append(Rule('REGEX', pattern.strip(), replacement.strip()))
+                except re.error as error:
+                    raise ValueError('line %d: %s' % (number, error))
+            else:
+                raise ValueError('line %d: expected "pattern => replacement" or "mirror"' % number)
+        return cls(rules)
+
+def build_mapping(names, rule_set, target_names):
+    '''map each unique name once, return (mapping of resolved names, sorted unresolved names)'''
+    target_names = target_names if isinstance(target_names, (set, frozenset, dict)) else set(target_names)
+    mapping = {}
+    unresolved = []
+
+    for name in set(names):
+        new_name = rule_set.apply(name)
+        if new_name in target_names:
+            mapping[name] = new_name
+        else:
+            unresolved.append(name)
+
+    return mapping, sorted(unresolved)
+
+def mirror_picker(node_model, axis=0.0, rename=mirror_name):
+    '''mirror picker node model in place, rows of every column are reversed, location is mirrored around x = axis'''
+    names = {}
+
+    for column in node_model.columns:
+        column.rows.reverse()
+        for row in column.rows:
+            if row.bone_name:
+                if row.bone_name not in names:
+                    names[row.bone_name] = rename(row.bone_name)
+                row.bone_name = names[row.bone_name]
+            if row.selection_set:
+                row.selection_set = rename(row.selection_set)
+
+    node_model.name = rename(node_model.name)
+    node_model.label = rename(node_model.label)
+    node_model.location[0] = axis * 2 - node_model.location[0] - node_model.width
+    node_model.parent = None
+
+    return node_model
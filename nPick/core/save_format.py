@@ -0,0 +1,69 @@
+# line delimited save format of npick.save_nodes, no bpy so it can be used outside blender
+#
+# first line is header {"format": "npick", "version": [major, minor, patch]}
+# every following line is one node {"name": node name, ...node save dict}
+
+import json
+
+FORMAT = 'npick'
+
+# version written by write_nodes
+VERSION = [0, 1, 0]
+
+# version of indented json written before line delimited format
+LEGACY_VERSION = [0, 0, 1]
+
+def encode(data):
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+def write_header(file, version=VERSION):
+    file.write(encode({'format': FORMAT, 'version': list(version)}) + '\n')
+
+def write_node(file, name, node_data):
+    '''write one node, name is written first so the line is readable on its own'''
+    line = {'name': name}
+    line.update(node_data)
+    file.write(encode(line) + '\n')
+
+def write_nodes(file, nodes, version=VERSION):
+    '''write header and nodes from iterable of (name, save dict)'''
+    write_header(file, version)
+
+    for name, node_data in nodes:
+        write_node(file, name, node_data)
+
+def write_legacy(file, nodes):
+    '''write nodes from iterable of (name, save dict) as legacy indented json'''
+    file.write(json.dumps({'version': list(LEGACY_VERSION), 'nodes': dict(nodes)}, indent=4))
+
+def read_header(file):
+    '''read header, return (version, nodes iterator of (name, save dict))'''
+    first_line = file.readline()
+
+    try:
+        header = json.loads(first_line)
+    except ValueError:
+        header = None
+
+    if not isinstance(header, dict) or header.get('format') != FORMAT:
+        # legacy indented json, parse whole file
+        data = json.loads(first_line + file.read())
+        return data.get('version', LEGACY_VERSION), iter(data['nodes'].items())
+
+    version = header['version']
+
+    if version[0] > VERSION[0]:
+        raise ValueError('unsupported npick version ' + '.'.join(str(x) for x in version))
+
+    return version, read_lines(file)
+
+def read_lines(file):
+    '''yield (name, save dict) while lines are read'''
+    for line in file:
+        if line.strip():
+            node_data = json.loads(line)
+            yield node_data.pop('name'), node_data
+
+def read_nodes(file):
+    '''iterate (name, save dict) of line delimited or legacy json file'''
+    return read_header(file)[1]
@@ -0,0 +1,189 @@
+import bpy
+import numpy
+import hashlib
+from bpy.app.handlers import persistent
+from ..core.remap import mirror_name, name_side
+
+class ArmatureCache:
+    '''bone lookup and selection index of one armature data'''
+    __slots__ = ('names', 'names_hash', 'indices', 'select', 'is_select_dirty', 'layer_mask', 'hidden')
+
+    def __init__(self, armature):
+        # bone names in armature.bones order, the order of foreach_get and foreach_set
+        self.names = [bone.name for bone in armature.bones]
+
+        # hash of bone names and order, bone indices of stored selections are valid while it matches
+        self.names_hash = hashlib.sha1('\n'.join(self.names).encode('utf-8')).hexdigest()
+
+        # name to bone index map
+        self.indices = {name: index for index, name in enumerate(self.names)}
+
+        # select flags of bones, read on demand
+        self.select = None
+        self.is_select_dirty = True
+
+        # 32 bit mask of layers that have bones, read on demand
+        self.layer_mask = None
+
+        # hidden flags of bones, hidden or only on hidden layers, read on demand
+        self.hidden = None
+
+    def get_select(self, armature):
+        '''select flags of bones, read in one pass after selection changed outside picker'''
+        if self.is_select_dirty:
+            self.select = numpy.zeros(len(self.names), dtype=bool)
+            armature.bones.foreach_get('select', self.select)
+            self.is_select_dirty = False
+
+        return self.select
+
+    def set_select(self, armature, select):
+        '''write select flags of bones in one pass'''
+        armature.bones.foreach_set('select', select)
+        self.select = select
+        self.is_select_dirty = False
+
+    def get_layer_mask(self, armature):
+        '''32 bit mask of layers that have bones, read in one pass'''
+        if self.layer_mask is None:
+            layers = numpy.zeros(len(self.names) * 32, dtype=bool)
+            armature.bones.foreach_get('layers', layers)
+            self.layer_mask = sum(1 << int(index) for index in numpy.flatnonzero(layers.reshape(-1, 32).any(axis=0)))
+
+        return self.layer_mask
+
+    def get_hidden(self, armature):
+        '''hidden flags of bones, bone hidden or not on any visible layer, read in one pass'''
+        if self.hidden is None:
+            hide = numpy.zeros(len(self.names), dtype=bool)
+            armature.bones.foreach_get('hide', hide)
+            layers = numpy.zeros(len(self.names) * 32, dtype=bool)
+            armature.bones.foreach_get('layers', layers)
+            self.hidden = hide | ~(layers.reshape(-1, 32) & numpy.array(armature.layers, dtype=bool)).any(axis=1)
+
+        return self.hidden
+
+    def get_selected(self, armature):
+        '''names of selected bones'''
+        return [self.names[index] for index in numpy.flatnonzero(self.get_select(armature))]
+
+# armature data pointer to ArmatureCache
+caches = {}
+
+def get_cache(object_armature, bone_name=None):
+    '''get cache of armature object, build when needed or when bone_name is missing from stale cache'''
+    return get_data_cache(object_armature.data, bone_name)
+
+def get_data_cache(armature, bone_name=None):
+    '''get cache of armature data'''
+    key = armature.as_pointer()
+    cache = caches.get(key)
+
+    if cache is None or len(cache.names) != len(armature.bones) or (bone_name and bone_name not in cache.indices and armature.bones.get(bone_name)):
+        cache = caches[key] = ArmatureCache(armature)
+
+    return cache
+
+def get_bone_state(armature):
+    '''(cache, select flags, hidden flags, active bone name) of armature data, read in bulk'''
+    cache = get_data_cache(armature)
+    active = armature.bones.active
+
+    return cache, cache.get_select(armature), cache.get_hidden(armature), active.name if active else ''
+
+class PoseCache:
+    '''pose bone lookup of one armature object, pose bone order can differ from armature bones'''
+    __slots__ = ('names', 'indices', 'pairs', 'sides')
+
+    def __init__(self, object_armature):
+        # pose bone names in pose.bones order, the order of foreach_get and foreach_set
+        self.names = [pose_bone.name for pose_bone in object_armature.pose.bones]
+
+        # name to pose bone index map
+        self.indices = {name: index for index, name in enumerate(self.names)}
+
+        # opposite side pose bone index and side of pose bones, built on demand
+        self.pairs = None
+        self.sides = None
+
+    def get_pairs(self):
+        '''pose bone index of opposite side bone, own index for center bones and bones without opposite'''
+        if self.pairs is None:
+            self.pairs = numpy.array([self.indices.get(mirror_name(name), index) for index, name in enumerate(self.names)], dtype=numpy.int64)
+
+        return self.pairs
+
+    def get_sides(self):
+        '''array of side of pose bones, 'L', 'R' or '' for center bones'''
+        if self.sides is None:
+            self.sides = numpy.array([name_side(name) or '' for name in self.names])
+
+        return self.sides
+
+    def get_mask(self, armature_cache, select):
+        '''select flags of armature bones in pose bone order'''
+        return select[[armature_cache.indices[name] for name in self.names]]
+
+# armature object pointer to PoseCache
+pose_caches = {}
+
+def get_pose_cache(object_armature):
+    '''get pose cache of armature object, rebuilt when bone count changed'''
+    key = object_armature.as_pointer()
+    cache = pose_caches.get(key)
+
+    if cache is None or len(cache.names) != len(object_armature.pose.bones):
+        cache = pose_caches[key] = PoseCache(object_armature)
+
+    return cache
+
+def get_pose_indices(object_armature):
+    '''name to index map of pose bones, order of foreach_get and foreach_set on pose.bones'''
+    return get_pose_cache(object_armature).indices
+
+def clear_caches():
+    caches.clear()
+    pose_caches.clear()
+
+def update_caches(updates):
+    '''drop or mark stale caches of updated armature data, called by depsgraph handler of redraw before bone state is read'''
+    for update in updates:
+        if not isinstance(update.id, bpy.types.Armature):
+            continue
+
+        key = update.id.original.as_pointer()
+        cache = caches.get(key)
+
+        if cache is None:
+            continue
+
+        if update.is_updated_geometry:
+            # bones may be added, removed or renamed
+            del caches[key]
+            pose_caches.clear()
+        else:
+            # selection, visibility or bone layers may be changed
+            cache.is_select_dirty = True
+            cache.layer_mask = None
+            cache.hidden = None
+
+@persistent
+def clear_caches_handler(dummy):
+    clear_caches()
+
+handlers = [
+    (bpy.app.handlers.undo_post, clear_caches_handler),
+    (bpy.app.handlers.redo_post, clear_caches_handler),
+    (bpy.app.handlers.load_post, clear_caches_handler)
+]
+
+def register():
+    for handler_list, handler in handlers:
+        handler_list.append(handler)
+
+def unregister():
+    for handler_list, handler in reversed(handlers):
+        if handler in handler_list:
+            handler_list.remove(handler)
+
+    clear_caches()
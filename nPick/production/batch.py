@@ -0,0 +1,26 @@
+from .draw_cache import invalidate
+from .redraw import request_redraw
+from .updates import suppress_updates
+
+def apply_property(nodes, name, value):
+    '''set property of nodes in one pass, equal values are not written, returns number of writes'''
+    writes = 0
+    trees = {}
+
+    # update callbacks are skipped, display states and redraw are handled once below
+    with suppress_updates():
+        for node in nodes:
+            if not hasattr(node, name) or getattr(node, name) == value:
+                continue
+
+            setattr(node, name, value)
+            trees[node.id_data.as_pointer()] = node.id_data
+            writes += 1
+
+    for tree in trees.values():
+        invalidate(tree)
+
+    if trees:
+        request_redraw(trees.keys())
+
+    return writes
@@ -0,0 +1,74 @@
+import time
+import bpy
+from bpy.app.handlers import persistent
+from .updates import is_suppressed
+
+# node tree pointer to {(node name, node pointer): (watched pointer, display state)}
+models = {}
+
+# node bl_idname to [hits, misses, build milliseconds]
+stats = {}
+
+def get_model(node, build, watched=None):
+    '''get cached display state of node, build(node) when missing or when watched datablock changed'''
+    tree_models = models.setdefault(node.id_data.as_pointer(), {})
+    key = (node.name, node.as_pointer())
+    watched_pointer = watched.as_pointer() if watched is not None else 0
+    cached = tree_models.get(key)
+    node_stats = stats.get(node.bl_idname)
+
+    if node_stats is None:
+        node_stats = stats[node.bl_idname] = [0, 0, 0.0]
+
+    if cached is None or cached[0] != watched_pointer:
+        start = time.perf_counter()
+        cached = tree_models[key] = (watched_pointer, build(node))
+        node_stats[1] += 1
+        node_stats[2] += (time.perf_counter() - start) * 1000
+    else:
+        node_stats[0] += 1
+
+    return cached[1]
+
+def invalidate(owner):
+    '''drop display states of node tree that owner (node, property group) belongs to'''
+    models.pop(owner.id_data.as_pointer(), None)
+
+def invalidate_watched(pointers):
+    '''drop display states watching any datablock pointer, called by depsgraph handler of redraw'''
+    for tree_models in models.values():
+        for key in [key for key, (watched_pointer, model) in tree_models.items() if watched_pointer in pointers]:
+            del tree_models[key]
+
+def update_invalidate(self, context):
+    '''update callback for properties shown in display state'''
+    if not is_suppressed():
+        invalidate(self)
+
+def clear_models():
+    models.clear()
+
+def clear_stats():
+    stats.clear()
+
+@persistent
+def clear_models_handler(dummy):
+    clear_models()
+
+handlers = [
+    (bpy.app.handlers.undo_post, clear_models_handler),
+    (bpy.app.handlers.redo_post, clear_models_handler),
+    (bpy.app.handlers.load_post, clear_models_handler)
+]
+
+def register():
+    for handler_list, handler in handlers:
+        handler_list.append(handler)
+
+def unregister():
+    for handler_list, handler in reversed(handlers):
+        if handler in handler_list:
+            handler_list.remove(handler)
+
+    clear_models()
+    clear_stats()
@@ -1,6 +1,78 @@
 import bpy
-from bpy.types import NodeTree, PropertyGroup, Menu
+from bpy.types import NodeTree, PropertyGroup
 from bpy.utils import register_class, unregister_class
+from bpy.app.handlers import persistent
+
+class PG_armature_binding(PropertyGroup):
+    '''armature slot of tree, nodes refer to slot by name'''
+    name: bpy.props.StringProperty(
+        name='name',
+        default='Armature'
+    )
+
+    def update_object_armature(self, context):
+        # nodes resolve armature through binding, one write rebinds every node of tree
+        # imported here, redraw and draw_cache are registered lazily
+        from .draw_cache import invalidate
+        from .redraw import request_redraw
+
+        invalidate(self)
+        request_redraw((self.id_data.as_pointer(),))
+
+    object_armature: bpy.props.PointerProperty(
+        type=bpy.types.Object,
+        poll=lambda self, obj: obj.type == "ARMATURE",
+        update=update_object_armature
+    )
+
+class PG_selection_set(PropertyGroup):
+    '''named bone selection of armature binding, stored as bone index bitset'''
+    name: bpy.props.StringProperty(
+        name='name',
+        default='Set'
+    )
+
+    binding: bpy.props.StringProperty(
+        name='binding',
+        default=''
+    )
+
+    # hex of bit per bone in armature.bones order
+    bitset: bpy.props.StringProperty(
+        default=''
+    )
+
+    # bone count when stored, bone index changes when bones are added or removed
+    bone_count: bpy.props.IntProperty(
+        default=0
+    )
+
+    # hash of bone names in armature.bones order when stored, empty for sets stored by older versions
+    names_hash: bpy.props.StringProperty(
+        default=''
+    )
+
+class PG_pose_snapshot(PropertyGroup):
+    '''local transforms of bones captured by pose snapshot node'''
+    name: bpy.props.StringProperty(
+        name='name',
+        default='Pose'
+    )
+
+    # name of pose snapshot node that captured it
+    node: bpy.props.StringProperty(
+        default=''
+    )
+
+    # captured bone names, one per line
+    bone_names: bpy.props.StringProperty(
+        default=''
+    )
+
+    # base64 of float32 array, one row of transform channels per bone
+    data: bpy.props.StringProperty(
+        default=''
+    )
 
 class editor_type(NodeTree):
     '''nPicker'''
@@ -8,34 +80,109 @@ class editor_type(NodeTree):
     bl_label = "nPicker"
     bl_icon = 'EYEDROPPER'
 
-class NODENPICK_MT_menu(Menu):
-    bl_label = "nPick"
+    armature_bindings: bpy.props.CollectionProperty(
+        type=PG_armature_binding
+    )
+
+    active_binding_index: bpy.props.IntProperty(
+        default=0
+    )
+
+    selection_sets: bpy.props.CollectionProperty(
+        type=PG_selection_set
+    )
+
+    pose_snapshots: bpy.props.CollectionProperty(
+        type=PG_pose_snapshot
+    )
 
-    def draw(self, context):
-        layout = self.layout
+def get_binding_name(node_tree, name):
+    '''binding name not used in tree, .001 style suffix is added when name is taken'''
+    unique = name
+    index = 1
+    while unique in node_tree.armature_bindings:
+        unique = '%s.%03d' % (name, index)
+        index += 1
+    return unique
 
-        layout.operator("npick.save_nodes")
-        layout.operator("npick.load_nodes")
+def get_binding(node_tree, object_armature):
+    '''binding of tree that points to object_armature, add one when missing'''
+    for binding in node_tree.armature_bindings:
+        if binding.object_armature == object_armature:
+            return binding
+
+    binding = node_tree.armature_bindings.add()
+    binding.name = get_binding_name(node_tree, object_armature.name)
+    binding.object_armature = object_armature
+
+    return binding
 
 classes = [
-    editor_type,
-    NODENPICK_MT_menu
+    PG_armature_binding,
+    PG_selection_set,
+    PG_pose_snapshot,
+    editor_type
 ]
 
-def extend_layout_save_load_node(self, context):
-    if context.space_data.type == "NODE_EDITOR" and context.space_data.tree_type == "nPicker" and context.space_data.node_tree is not None:
-        self.layout.menu("NODENPICK_MT_menu")
+# header and load_post stub is appended
+is_stub_registered = False
+
+def register_lazy_modules():
+    '''register nodes and operators, package removes stub when done'''
+    from .. import register_lazy_modules as register_package_lazy_modules
+
+    register_package_lazy_modules()
+
+    # redraw node editors to show menus and nodes
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'NODE_EDITOR':
+                area.tag_redraw()
+
+def stub_lazy_register(self, context):
+    '''header stub, register everything on first use of nPicker tree'''
+    if context.space_data.tree_type == 'nPicker' and not bpy.app.timers.is_registered(register_lazy_modules):
+        # can not register class while drawing
+        bpy.app.timers.register(register_lazy_modules, first_interval=0)
+
+@persistent
+def stub_load_post(dummy):
+    '''register everything when loaded file already has nPicker tree with nodes'''
+    if any(node_tree.bl_idname == 'nPicker' and node_tree.nodes for node_tree in bpy.data.node_groups) and not bpy.app.timers.is_registered(register_lazy_modules):
+        # registering removes this handler, can not change load_post while it is being run
+        bpy.app.timers.register(register_lazy_modules, first_interval=0)
+
+def register_stub():
+    global is_stub_registered
+
+    bpy.types.NODE_HT_header.append(stub_lazy_register)
+    bpy.app.handlers.load_post.append(stub_load_post)
+    is_stub_registered = True
+
+    # addon enabled with file already open, bpy.data is restricted on startup
+    try:
+        stub_load_post(None)
+    except AttributeError:
+        pass
+
+def unregister_stub():
+    global is_stub_registered
+
+    if is_stub_registered:
+        bpy.types.NODE_HT_header.remove(stub_lazy_register)
+        bpy.app.handlers.load_post.remove(stub_load_post)
+        is_stub_registered = False
+
+    # addon disabled before deferred register was run
+    if bpy.app.timers.is_registered(register_lazy_modules):
+        bpy.app.timers.unregister(register_lazy_modules)
 
 def register():
     for x in classes:
         register_class(x)
 
-    # append save and load node in header
-    bpy.types.NODE_MT_editor_menus.append(extend_layout_save_load_node)
-
 def unregister():
+    unregister_stub()
+
     for x in reversed(classes):
         unregister_class(x)
-
-    # remove save and load node in header
-    bpy.types.NODE_MT_editor_menus.remove(extend_layout_save_load_node)
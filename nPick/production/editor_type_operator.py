@@ -1,9 +1,14 @@
 import os
-import json
+import re
 import bpy
 from bpy.types import Operator, Menu, NodeFrame
 from bpy.utils import register_class, unregister_class
 from bpy_extras.io_utils import ExportHelper, ImportHelper
+from ..core import save_format, model, remap
+from .draw_cache import invalidate
+from .updates import suppress_updates
+from .batch import apply_property
+from .editor_type import get_binding, get_binding_name
 
 class NPICK_OP_BASE(Operator):
     bl_options = {'REGISTER', 'UNDO'}
@@ -21,20 +26,8 @@ class NPICK_OP_switch_compact_mode(NPICK_OP_BASE):
     )
 
     def execute(self, context):
-        # store selected nodes
-        selected_nodes = context.selected_nodes
-
-        for node in context.selected_nodes:
-            # change mode_compact in all selected node if exist
-            if hasattr(node, 'mode_compact'):
-                node.mode_compact = self.mode
-
-        # update current node tree with deselect operator
-        bpy.ops.node.select_all(action='DESELECT')
-
-        # reselect node
-        for node in selected_nodes:
-            node.select = True
+        # change mode_compact in all selected node if exist
+        apply_property(context.selected_nodes, 'mode_compact', self.mode)
         return {'FINISHED'}
 
 class NPICK_OP_switch_select_picker_mode(NPICK_OP_BASE):
@@ -51,64 +44,109 @@ class NPICK_OP_switch_select_picker_mode(NPICK_OP_BASE):
     )
 
     def execute(self, context):
-        # store selected nodes
-        selected_nodes = context.selected_nodes
+        # change mode_select in all selected node if exist
+        apply_property(context.selected_nodes, 'mode_select', self.mode)
+        return {'FINISHED'}
 
-        for node in context.selected_nodes:
-            # change mode_select in all selected node if exist
-            if hasattr(node, 'mode_select'):
-                node.mode_select = self.mode
+def save_frame(node):
+    '''generate save dict for frame'''
+    node_model = model.FrameNode(
+        node.name,
+        node.bl_idname,
+        node.label,
+        node.location,
+        node.width,
+        node.height,
+        node.hide,
+        node.parent.name if node.parent else None,
+        node.use_custom_color,
+        node.color
+    )
+    node_model.label_size = node.label_size
+    node_model.shrink = node.shrink
+    return node_model.to_dict()
+
+def load_frame(node, save_dict):
+    '''load frame property from save dict, parent is resolved by loader'''
+    node_model = model.node_from_dict(node.name, save_dict)
+    node.label = node_model.label
+    node.location = tuple(node_model.location)
+    node.width = node_model.width
+    node.height = node_model.height
+    node.hide = node_model.hide
+    node.use_custom_color = node_model.use_custom_color
+    node.color = tuple(node_model.color)
+    node.label_size = node_model.label_size
+    node.shrink = node_model.shrink
+
+def iter_save_nodes(node_tree):
+    '''yield (name, save dict) of nodes that can be saved'''
+    for node in node_tree.nodes:
+        # get node save dict
+        if hasattr(node, 'save') and callable(node.save):
+            yield node.name, node.save()
+        # save dict for frame
+        elif isinstance(node, NodeFrame):
+            yield node.name, save_frame(node)
+
+def save_nodes(node_tree, file):
+    '''write nodes of node tree to file node by node'''
+    save_format.write_nodes(file, iter_save_nodes(node_tree))
+
+def load_nodes(node_tree, file):
+    '''build nodes from file, return dict of save name to new node'''
+    nodes = node_tree.nodes
+
+    # dict nodes for parent, {save name: {'node': new node, 'data': save dict}}
+    parent_nodes = {}
+
+    # first pass, create every node while lines are read
+    for node_name, node_data in save_format.read_nodes(file):
+        parent_nodes[node_name] = {
+            'node': nodes.new(node_data['type']),
+            'data': node_data
+        }
+
+    with suppress_updates():
+        # second pass, load property without update callback
+        for item in parent_nodes.values():
+            if isinstance(item['node'], NodeFrame):
+                load_frame(item['node'], item['data'])
+            else:
+                item['node'].load(item['data'], parent_nodes)
 
-        # update current node tree with deselect operator
-        bpy.ops.node.select_all(action='DESELECT')
+        # third pass, resolve parent from name index
+        for item in parent_nodes.values():
+            if item['data']['parent'] in parent_nodes:
+                item['node'].parent = parent_nodes[item['data']['parent']]['node']
 
-        # reselect node
-        for node in selected_nodes:
-            node.select = True
-        return {'FINISHED'}
+        # saved location is relative to parent, set again after parenting
+        for item in parent_nodes.values():
+            if item['node'].parent:
+                item['node'].location = tuple(item['data']['location'])
+
+    # one update for the whole tree
+    invalidate(node_tree)
+
+    return {node_name: item['node'] for node_name, item in parent_nodes.items()}
 
 class NPICK_OP_save_nodes(NPICK_OP_BASE, ExportHelper):
-    """save current nodes in node tree to json file"""
+    """save current nodes in node tree to npick file"""
     bl_idname = "npick.save_nodes"
     bl_label = "save nodes"
 
-    filename_ext = ".json"
+    filename_ext = ".npick"
 
     filter_glob: bpy.props.StringProperty(
-        default="*.json",
+        default="*.npick",
         options={'HIDDEN'},
         maxlen=255
     )
 
     def execute(self, context):
-        save_dict = {
-            "version": [0, 0, 1],
-            "nodes": {}
-        }
-        for node in context.space_data.node_tree.nodes:
-            # get node save dict
-            if hasattr(node, 'save') and callable(node.save):
-                save_dict['nodes'][node.name] = node.save()
-            # save dict for frame
-            elif isinstance(node, NodeFrame):
-                save_dict['nodes'][node.name] = {
-                    "type": node.bl_idname,
-                    "label": node.label,
-                    "location": list(node.location),
-                    "width": node.width,
-                    "height": node.height,
-                    "hide": node.hide,
-                    "parent": node.parent.name if node.parent else None,
-                    "use_custom_color": node.use_custom_color,
-                    "color": list(node.color),
-                    "label_size": node.label_size,
-                    "shrink": node.shrink
-                }
-
-        # save to the file
-        file = open(self.filepath, "w+")
-        file.write(json.dumps(save_dict, indent=4))
-        file.close()
+        # save to the file node by node
+        with open(self.filepath, "w", encoding="utf-8") as file:
+            save_nodes(context.space_data.node_tree, file)
 
         # simple alert
         self.report({'INFO'}, "SAVE SUCCESS")
@@ -116,55 +154,189 @@ class NPICK_OP_save_nodes(NPICK_OP_BASE, ExportHelper):
         return {'FINISHED'}
 
 class NPICK_OP_load_nodes(NPICK_OP_BASE, ImportHelper):
-    """load nodes from json file"""
+    """load nodes from npick or json file"""
     bl_idname = "npick.load_nodes"
     bl_label = "load nodes"
 
-    filename_ext = ".json"
+    filename_ext = ".npick"
 
     filter_glob: bpy.props.StringProperty(
-        default="*.json",
+        default="*.npick;*.json",
         options={'HIDDEN'},
         maxlen=255
     )
 
     def execute(self, context):
         # load the file
-        file = open(self.filepath, "r")
-        nodes_data = json.loads(file.read())
-        file.close()
+        with open(self.filepath, "r", encoding="utf-8") as file:
+            load_nodes(context.space_data.node_tree, file)
 
-        # dict nodes for parent
-        parent_nodes = {}
+        # redraw once after every node is loaded
+        context.area.tag_redraw()
 
-        for node_name, node_data in nodes_data['nodes'].items():
-            # new node
-            new_node = context.space_data.node_tree.nodes.new(node_data['type'])
+        # simple alert
+        self.report({'INFO'}, "LOAD SUCCESS")
 
-            parent_nodes[node_name] = {
-                'node': new_node
-            }
+        return {'FINISHED'}
 
-            # load property
-            if not isinstance(new_node, NodeFrame):
-                new_node.load(node_data, parent_nodes)
-            else:
-                new_node.label = node_data['label']
-                new_node.location = tuple(node_data['location'])
-                new_node.width = node_data['width']
-                new_node.height = node_data['height']
-                new_node.hide = node_data['hide']
-                new_node.parent = nodes[node_data['parent']]['node'] if node_data['parent'] else None
-                new_node.use_custom_color = node_data['use_custom_color']
-                new_node.color = tuple(node_data['color'])
-                new_node.label_size = node_data['label_size']
-                new_node.shrink = node_data['shrink']
+def iter_bone_references(node_tree):
+    '''yield picker rows and nodes of node tree that reference a bone with bone_name'''
+    for node in node_tree.nodes:
+        if hasattr(node, 'picker_columns'):
+            for picker_column in node.picker_columns:
+                for picker_row in picker_column.rows:
+                    if picker_row.bone_name:
+                        yield picker_row
+        elif getattr(node, 'bone_name', ''):
+            yield node
+
+# text datablock that lists bones retarget could not resolve
+unresolved_text_name = 'nPick Unresolved Bones'
+
+class NPICK_OP_retarget_bones(NPICK_OP_BASE):
+    """rename bones of picker rows and bone nodes in node tree to match armature"""
+    bl_idname = "npick.retarget_bones"
+    bl_label = "retarget bones"
+
+    object_armature_name: bpy.props.StringProperty(
+        name='Armature',
+        default=''
+    )
 
-        # simple alert
-        self.report({'INFO'}, "LOAD SUCCESS")
+    rules_text_name: bpy.props.StringProperty(
+        name='Rules Text',
+        description='text with one rule per line, "pattern => replacement" or "mirror"',
+        default=''
+    )
+
+    pattern: bpy.props.StringProperty(
+        name='Pattern',
+        description='regex pattern applied after rules text',
+        default=''
+    )
+
+    replacement: bpy.props.StringProperty(
+        name='Replacement',
+        default=''
+    )
+
+    use_mirror: bpy.props.BoolProperty(
+        name='Mirror',
+        description='swap side of bone names, .L <-> .R',
+        default=False
+    )
+
+    binding: bpy.props.StringProperty(
+        name='Binding',
+        description='armature binding to point at armature, other bindings are kept',
+        default=''
+    )
+
+    assign_armature: bpy.props.BoolProperty(
+        name='Assign Armature',
+        description='bind nodes without binding to armature',
+        default=False
+    )
+
+    def invoke(self, context, event):
+        if context.object and context.object.type == 'ARMATURE':
+            self.object_armature_name = context.object.name
+        return context.window_manager.invoke_props_dialog(self, width=350)
+
+    def draw(self, context):
+        layout = self.layout
+
+        col = layout.column()
+        col.prop_search(self, 'object_armature_name', bpy.data, 'objects')
+        col.prop_search(self, 'rules_text_name', bpy.data, 'texts')
+        col.prop(self, 'pattern')
+        col.prop(self, 'replacement')
+        col.prop(self, 'use_mirror')
+        col.prop_search(self, 'binding', context.space_data.node_tree, 'armature_bindings', icon='LINKED')
+        col.prop(self, 'assign_armature')
+
+    def get_rule_set(self):
+        '''rule set from rules text, pattern and mirror, raise ValueError on bad rule'''
+        text = bpy.data.texts.get(self.rules_text_name)
+        rule_set = remap.RuleSet.parse(text.as_string()) if text else remap.RuleSet()
+
+        if self.pattern:
+            try:
+                rule_set.rules.append(remap.Rule('REGEX', self.pattern, self.replacement))
+            except re.error as error:
+                raise ValueError('pattern: ' + str(error))
+
+        if self.use_mirror:
+            rule_set.rules.append(remap.Rule('MIRROR'))
+
+        return rule_set
+
+    def execute(self, context):
+        object_armature = bpy.data.objects.get(self.object_armature_name)
+
+        if object_armature is None or object_armature.type != 'ARMATURE':
+            self.report({'ERROR'}, "SELECT ARMATURE")
+            return {'CANCELLED'}
+
+        try:
+            rule_set = self.get_rule_set()
+        except ValueError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+
+        node_tree = context.space_data.node_tree
+        references = list(iter_bone_references(node_tree))
+
+        # name index of target armature, each unique name is mapped once
+        mapping, unresolved = remap.build_mapping([reference.bone_name for reference in references], rule_set, set(object_armature.data.bones.keys()))
+
+        with suppress_updates():
+            for reference in references:
+                new_name = mapping.get(reference.bone_name)
+                if new_name is not None and new_name != reference.bone_name:
+                    reference.bone_name = new_name
+
+            binding = node_tree.armature_bindings.get(self.binding)
+            if binding is not None:
+                binding.object_armature = object_armature
+
+            if self.assign_armature:
+                for node in node_tree.nodes:
+                    if hasattr(node, 'binding') and node.object_armature is None:
+                        node.object_armature = object_armature
+
+        invalidate(node_tree)
+
+        if len(unresolved) > 10:
+            # full list does not fit report, one bone name per line in text datablock
+            text = bpy.data.texts.get(unresolved_text_name) or bpy.data.texts.new(unresolved_text_name)
+            text.from_string('\n'.join(unresolved))
+            self.report({'WARNING'}, "%d UNRESOLVED: %s, ... (see text %s)" % (len(unresolved), ', '.join(unresolved[:10]), text.name))
+        elif unresolved:
+            self.report({'WARNING'}, "%d UNRESOLVED: %s" % (len(unresolved), ', '.join(unresolved)))
+        else:
+            self.report({'INFO'}, "RETARGET SUCCESS")
 
         return {'FINISHED'}
 
+class NODENPICK_MT_menu(Menu):
+    bl_label = "nPick"
+
+    def draw(self, context):
+        layout = self.layout
+
+        layout.operator("npick.save_nodes")
+        layout.operator("npick.load_nodes")
+        layout.separator()
+        layout.operator("npick.generate_picker")
+        layout.operator("npick.retarget_bones")
+        layout.separator()
+        layout.operator("npick.key_picker_selection")
+        layout.operator("npick.reset_pose_selection")
+        layout.operator("npick.mirror_pose_selection")
+        layout.operator("npick.copy_pose_side", text="copy pose L -> R").side = 'L'
+        layout.operator("npick.copy_pose_side", text="copy pose R -> L").side = 'R'
+
 class NPICK_MT_PIE_menu(Menu):
     bl_label = "nPick Pie Menu"
 
@@ -187,21 +359,72 @@ class NPICK_MT_PIE_menu(Menu):
         op.mode = 'MULTI'
         op = pie.operator('npick.switch_select_picker_mode', icon='NODE_SEL', text='Select Single Bone Mode')
         op.mode = 'SINGLE'
+        pie.operator('npick.mirror_picker', icon='MOD_MIRROR', text='Mirror Picker')
+
+class NPICK_OP_add_armature_binding(NPICK_OP_BASE):
+    """add armature binding to node tree"""
+    bl_idname = "npick.add_armature_binding"
+    bl_label = "add armature binding"
+
+    def execute(self, context):
+        node_tree = context.space_data.node_tree
+
+        # bind active armature when there is one
+        if context.object and context.object.type == 'ARMATURE':
+            binding = get_binding(node_tree, context.object)
+        else:
+            name = get_binding_name(node_tree, 'Armature')
+            binding = node_tree.armature_bindings.add()
+            binding.name = name
+
+        node_tree.active_binding_index = node_tree.armature_bindings.find(binding.name)
+
+        return {'FINISHED'}
+
+class NPICK_OP_remove_armature_binding(NPICK_OP_BASE):
+    """remove armature binding from node tree, nodes of binding become unbound"""
+    bl_idname = "npick.remove_armature_binding"
+    bl_label = "remove armature binding"
+
+    index: bpy.props.IntProperty(default=-1)
+
+    def execute(self, context):
+        node_tree = context.space_data.node_tree
+
+        if not 0 <= self.index < len(node_tree.armature_bindings):
+            return {'CANCELLED'}
+
+        node_tree.armature_bindings.remove(self.index)
+        node_tree.active_binding_index = min(node_tree.active_binding_index, len(node_tree.armature_bindings) - 1)
+        invalidate(node_tree)
+
+        return {'FINISHED'}
 
 classes = [
     NPICK_OP_switch_compact_mode,
     NPICK_OP_switch_select_picker_mode,
     NPICK_OP_save_nodes,
     NPICK_OP_load_nodes,
+    NPICK_OP_retarget_bones,
+    NPICK_OP_add_armature_binding,
+    NPICK_OP_remove_armature_binding,
+    NODENPICK_MT_menu,
     NPICK_MT_PIE_menu
 ]
 
 addon_keymaps = []
 
+def extend_layout_save_load_node(self, context):
+    if context.space_data.type == "NODE_EDITOR" and context.space_data.tree_type == "nPicker" and context.space_data.node_tree is not None:
+        self.layout.menu("NODENPICK_MT_menu")
+
 def register():
     for x in classes:
         register_class(x)
 
+    # append save and load node in header
+    bpy.types.NODE_MT_editor_menus.append(extend_layout_save_load_node)
+
     # register shortcut
     window_manager = bpy.context.window_manager
     keyconfig = window_manager.keyconfigs.addon
@@ -226,6 +449,9 @@ def unregister():
     for x in reversed(classes):
         unregister_class(x)
 
+    # remove save and load node in header
+    bpy.types.NODE_MT_editor_menus.remove(extend_layout_save_load_node)
+
     # unregister shortcut
     for keymap, keymap_item in addon_keymaps:
         keymap.keymap_items.remove(keymap_item)
@@ -0,0 +1,115 @@
+from bpy.types import Operator, Panel
+from bpy.utils import register_class, unregister_class
+from . import draw_cache
+from .preferences import get_preferences
+
+class NPICK_OP_reset_cache_stats(Operator):
+    """reset display state cache statistics"""
+    bl_idname = "npick.reset_cache_stats"
+    bl_label = "reset"
+
+    def execute(self, context):
+        draw_cache.clear_stats()
+
+        return {'FINISHED'}
+
+class NODE_NPICK_PT_armature_bindings(Panel):
+    bl_space_type = 'NODE_EDITOR'
+    bl_region_type = 'UI'
+    bl_category = "nPick"
+    bl_label = "Armatures"
+
+    @classmethod
+    def poll(cls, context):
+        return context.space_data.tree_type == "nPicker" and context.space_data.node_tree is not None
+
+    def draw(self, context):
+        layout = self.layout
+        node_tree = context.space_data.node_tree
+
+        col = layout.column(align=True)
+        for index, binding in enumerate(node_tree.armature_bindings):
+            row = col.row(align=True)
+            # nodes refer to binding by name, name is not editable here
+            row.label(text=binding.name, icon='LINKED')
+            row.prop(binding, 'object_armature', text='')
+            op = row.operator('npick.remove_armature_binding', text='', icon='REMOVE')
+            op.index = index
+
+        layout.operator('npick.add_armature_binding', text='Add Armature', icon='ADD')
+
+class NODE_NPICK_PT_selection_sets(Panel):
+    bl_space_type = 'NODE_EDITOR'
+    bl_region_type = 'UI'
+    bl_category = "nPick"
+    bl_label = "Selection Sets"
+
+    @classmethod
+    def poll(cls, context):
+        return context.space_data.tree_type == "nPicker" and context.space_data.node_tree is not None
+
+    def draw(self, context):
+        layout = self.layout
+        node_tree = context.space_data.node_tree
+
+        col = layout.column(align=True)
+        for index, selection_set in enumerate(node_tree.selection_sets):
+            row = col.row(align=True)
+            op = row.operator('npick.apply_selection_set', text=selection_set.name)
+            op.name = selection_set.name
+            op.mode = 'SET'
+            for mode, icon in (('ADD', 'ADD'), ('SUBTRACT', 'REMOVE'), ('INTERSECT', 'SELECT_INTERSECT')):
+                op = row.operator('npick.apply_selection_set', text='', icon=icon)
+                op.name = selection_set.name
+                op.mode = mode
+            op = row.operator('npick.update_selection_set', text='', icon='FILE_REFRESH')
+            op.index = index
+            op = row.operator('npick.remove_selection_set', text='', icon='X')
+            op.index = index
+
+        layout.operator('npick.add_selection_set', text='Add Selection Set', icon='ADD')
+
+class NODE_NPICK_PT_debug(Panel):
+    bl_space_type = 'NODE_EDITOR'
+    bl_region_type = 'UI'
+    bl_category = "nPick"
+    bl_label = "Debug"
+
+    @classmethod
+    def poll(cls, context):
+        preferences = get_preferences(context)
+        return context.space_data.tree_type == "nPicker" and preferences is not None and preferences.show_debug_panel
+
+    def draw(self, context):
+        layout = self.layout
+
+        split = layout.split(factor=0.4)
+        col_name = split.column()
+        col_name.label(text='Node')
+        col_hit = split.column()
+        col_hit.label(text='Hit Rate')
+        col_build = split.column()
+        col_build.label(text='Build')
+
+        for bl_idname, (hits, misses, build_ms) in sorted(draw_cache.stats.items()):
+            col_name.label(text=bl_idname.replace('NodeNPick', ''))
+            col_hit.label(text='%.1f%% (%d/%d)' % (hits * 100 / (hits + misses), hits, hits + misses))
+            col_build.label(text='%.2f ms' % build_ms)
+
+        layout.label(text='Cached Nodes: %d' % sum(len(tree_models) for tree_models in draw_cache.models.values()))
+        layout.operator('npick.reset_cache_stats')
+
+classes = [
+    NPICK_OP_reset_cache_stats,
+    NODE_NPICK_PT_armature_bindings,
+    NODE_NPICK_PT_selection_sets,
+    NODE_NPICK_PT_debug
+]
+
+def register():
+    for x in classes:
+        register_class(x)
+
+def unregister():
+    for x in reversed(classes):
+        unregister_class(x)
@@ -0,0 +1,143 @@
+import bpy
+import numpy
+from bpy.types import Operator
+from bpy.utils import register_class, unregister_class
+from .armature_cache import get_cache
+
+class NPICK_OP_BASE(Operator):
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, context):
+        return context.space_data.type == "NODE_EDITOR" and context.space_data.tree_type == "nPicker" and context.space_data.node_tree is not None
+
+# pose bone property to array length
+channel_sizes = {
+    'location': 3,
+    'rotation_quaternion': 4,
+    'rotation_axis_angle': 4,
+    'rotation_euler': 3,
+    'scale': 3
+}
+
+# rotation mode to pose bone property, other modes are euler
+rotation_channels = {
+    'QUATERNION': 'rotation_quaternion',
+    'AXIS_ANGLE': 'rotation_axis_angle'
+}
+
+def read_channel(pose_bones, name, size):
+    '''(bone count, size) array of pose bone property in one read'''
+    values = numpy.zeros(len(pose_bones) * size, dtype=numpy.float32)
+    pose_bones.foreach_get(name, values)
+    return values.reshape(-1, size)
+
+def insert_key(fcurve, frame, value):
+    '''insert or replace key at frame, keys are read and written in one pass'''
+    keyframe_points = fcurve.keyframe_points
+    count = len(keyframe_points)
+    co = numpy.zeros(count * 2, dtype=numpy.float32)
+    keyframe_points.foreach_get('co', co)
+    co = co.reshape(-1, 2)
+
+    index = numpy.flatnonzero(numpy.isclose(co[:, 0], frame))
+    if index.size:
+        # handles move with replaced key, fcurve.update only recalculates auto handles
+        keyframe_point = keyframe_points[int(index[0])]
+        delta = value - co[index[0], 1]
+        keyframe_point.handle_left[1] += delta
+        keyframe_point.handle_right[1] += delta
+        co[index[0], 1] = value
+    else:
+        keyframe_points.add(1)
+        # float32 row keeps array float32, foreach_set converts other types element by element
+        co = numpy.append(co, numpy.array([[frame, value]], dtype=numpy.float32), axis=0)
+
+    keyframe_points.foreach_set('co', co.ravel())
+
+def key_bones(object_armature, mask, frame):
+    '''keyframe location, rotation and scale of bones in mask at frame, returns number of keys'''
+    pose_bones = object_armature.pose.bones
+    cache = get_cache(object_armature)
+
+    # pose bones are matched by name, order of pose bones can differ from armature bones
+    selected = [(index, pose_bone) for index, pose_bone in enumerate(pose_bones) if pose_bone.name in cache.indices and mask[cache.indices[pose_bone.name]]]
+
+    if not selected:
+        return 0
+
+    # channel names of each selected bone, every channel is read for all bones in one pass
+    selected = [(index, pose_bone, ('location', rotation_channels.get(pose_bone.rotation_mode, 'rotation_euler'), 'scale')) for index, pose_bone in selected]
+    channels = {name: read_channel(pose_bones, name, channel_sizes[name]) for name in set(name for index, pose_bone, names in selected for name in names)}
+
+    animation_data = object_armature.animation_data or object_armature.animation_data_create()
+    if animation_data.action is None:
+        animation_data.action = bpy.data.actions.new(object_armature.name + 'Action')
+    action = animation_data.action
+
+    # existing fcurves indexed once, action.fcurves.find is a linear search
+    fcurves = {(fcurve.data_path, fcurve.array_index): fcurve for fcurve in action.fcurves}
+
+    count = 0
+    for index, pose_bone, names in selected:
+        path = pose_bone.path_from_id() + '.'
+
+        for name in names:
+            values = channels[name][index]
+
+            for array_index, value in enumerate(values):
+                fcurve = fcurves.get((path + name, array_index))
+                if fcurve is None:
+                    fcurve = fcurves[(path + name, array_index)] = action.fcurves.new(path + name, index=array_index, action_group=pose_bone.name)
+
+                insert_key(fcurve, frame, float(value))
+                fcurve.update()
+                count += 1
+
+    return count
+
+def tag_redraw_animation(context):
+    if context.screen:
+        for area in context.screen.areas:
+            if area.type in {'DOPESHEET_EDITOR', 'GRAPH_EDITOR', 'TIMELINE', 'NLA_EDITOR'}:
+                area.tag_redraw()
+
+class NPICK_OP_key_picker_selection(NPICK_OP_BASE):
+    """keyframe location, rotation and scale of selected bones of picker armature"""
+    bl_idname = "npick.key_picker_selection"
+    bl_label = "key picker selection"
+
+    node_tree_name: bpy.props.StringProperty(default="")
+    node_object_name: bpy.props.StringProperty(default="")
+
+    def execute(self, context):
+        # named node from picker button, active node from menu
+        if self.node_tree_name:
+            node = bpy.data.node_groups[self.node_tree_name].nodes[self.node_object_name]
+        else:
+            node = context.space_data.node_tree.nodes.active
+
+        object_armature = getattr(node, 'object_armature', None)
+
+        if object_armature is None:
+            self.report({'ERROR'}, "SELECT ARMATURE")
+            return {'CANCELLED'}
+
+        cache = get_cache(object_armature)
+        count = key_bones(object_armature, cache.get_select(object_armature.data), context.scene.frame_current)
+        tag_redraw_animation(context)
+
+        self.report({'INFO'}, "%d KEYS" % count)
+
+        return {'FINISHED'}
+
+classes = [
+    NPICK_OP_key_picker_selection
+]
+
+def register():
+    for x in classes:
+        register_class(x)
+
+def unregister():
+    for x in reversed(classes):
+        unregister_class(x)
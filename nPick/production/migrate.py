@@ -0,0 +1,68 @@
+import bpy
+from bpy.app.handlers import persistent
+from .draw_cache import invalidate
+from .updates import suppress_updates
+
+def migrate_object_armature(node):
+    '''bind object_armature stored on node by older versions to armature binding of tree, returns True when changed'''
+    if 'object_armature' not in node:
+        return False
+
+    # unregistered property stays on node as id property
+    if not node.binding and isinstance(node['object_armature'], bpy.types.Object):
+        node.object_armature = node['object_armature']
+    del node['object_armature']
+
+    return True
+
+def migrate_picker_rows(node):
+    '''move object_armature and mode_select stored on every picker row by older versions to node, returns True when changed'''
+    is_changed = False
+
+    for picker_column in node.picker_columns:
+        for picker_row in picker_column.rows:
+            if 'object_armature' in picker_row:
+                if node.object_armature is None and isinstance(picker_row['object_armature'], bpy.types.Object):
+                    node.object_armature = picker_row['object_armature']
+                del picker_row['object_armature']
+                is_changed = True
+
+            if 'mode_select' in picker_row:
+                del picker_row['mode_select']
+                is_changed = True
+
+    return is_changed
+
+def migrate_tree(node_tree):
+    '''upgrade nPicker tree saved by older versions'''
+    is_changed = False
+
+    with suppress_updates():
+        for node in node_tree.nodes:
+            if hasattr(node, 'binding'):
+                is_changed = migrate_object_armature(node) or is_changed
+
+            if node.bl_idname == 'NodeNPickBonePicker':
+                is_changed = migrate_picker_rows(node) or is_changed
+
+    if is_changed:
+        invalidate(node_tree)
+
+@persistent
+def migrate_trees(dummy):
+    for node_tree in bpy.data.node_groups:
+        if node_tree.bl_idname == 'nPicker':
+            migrate_tree(node_tree)
+
+def register():
+    bpy.app.handlers.load_post.append(migrate_trees)
+
+    # registered after file is loaded, bpy.data is restricted on startup
+    try:
+        migrate_trees(None)
+    except AttributeError:
+        pass
+
+def unregister():
+    if migrate_trees in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(migrate_trees)
@@ -1,5 +1,193 @@
 import nodeitems_utils
+from bpy.types import Node as OriNode
 from nodeitems_utils import NodeItem, NodeCategory as OriNodeCategory
+from .draw_cache import get_model
+from .editor_type import get_binding
+from .redraw import watch
+from ..core import model
+
+class Node(OriNode):
+    '''base of nPick nodes, draw_buttons and draw_buttons_ext share one display state'''
+
+    # (label, property name, prop keyword arguments) drawn in node settings
+    setting_props = ()
+
+    # core model class of node
+    model_type = model.Node
+
+    @classmethod
+    def poll(cls, ntree):
+        return ntree.bl_idname == 'nPicker'
+
+    # binding property holds name of armature binding of node tree, it is declared on every node class,
+    # annotations of base classes derived from bpy types are not registered
+
+    @property
+    def object_armature(self):
+        '''armature object of binding, None when not bound'''
+        binding = self.id_data.armature_bindings.get(self.binding)
+        return binding.object_armature if binding is not None else None
+
+    @object_armature.setter
+    def object_armature(self, object_armature):
+        # bind to slot that already points to armature, nodes share slots
+        self.binding = get_binding(self.id_data, object_armature).name if object_armature is not None else ''
+
+    def get_watched(self):
+        '''datablock that display state is built from, state is rebuilt when it changes'''
+        return None
+
+    def build_display_state(self):
+        '''compute what draw_display needs, called once per data change'''
+        return None
+
+    def get_display_state(self):
+        return get_model(self, type(self).build_display_state, self.get_watched())
+
+    def draw_setting(self, layout, name, kwargs):
+        if name == 'binding':
+            row = layout.row(align=True)
+            row.prop_search(self, 'binding', self.id_data, 'armature_bindings', text='', icon='LINKED')
+            binding = self.id_data.armature_bindings.get(self.binding)
+            if binding is not None:
+                row.prop(binding, 'object_armature', text='')
+        else:
+            layout.prop(self, name, **kwargs)
+
+    def draw_settings(self, context, layout):
+        row = layout.row()
+        split = row.split(factor=0.4)
+        col = split.column()
+        col.alignment = 'RIGHT'
+        for label, name, kwargs in self.setting_props:
+            col.label(text=label)
+        col.label(text='Custom Color')
+        col.label(text='Color')
+        col = split.column()
+        for label, name, kwargs in self.setting_props:
+            self.draw_setting(col, name, kwargs)
+        col.prop(self, 'use_custom_color', text='')
+        col.prop(self, 'color', text='')
+
+        row = layout.row()
+        row.scale_y = 1.25
+        row.prop(self, 'mode_compact', text='Compact Mode', toggle=True)
+
+    def draw_display(self, context, layout, state, is_ext):
+        '''draw node content from display state, is_ext when drawing in sidebar'''
+        pass
+
+    def draw_buttons(self, context, layout):
+        if not self.mode_compact:
+            self.draw_settings(context, layout)
+
+        self.draw_display(context, layout, self.get_display_state(), False)
+
+    def draw_buttons_ext(self, context, layout):
+        self.draw_settings(context, layout)
+        self.draw_display(context, layout, self.get_display_state(), True)
+
+    def to_model(self):
+        '''create core model of node'''
+        return self.model_type(
+            self.name,
+            self.bl_idname,
+            self.label,
+            self.location,
+            self.width,
+            self.height,
+            self.hide,
+            self.parent.name if self.parent else None,
+            self.use_custom_color,
+            self.color
+        )
+
+    def load_model(self, node_model):
+        '''load property from core model, parent is resolved by loader after every node is created'''
+        self.label = node_model.label
+        self.location = tuple(node_model.location)
+        self.width = node_model.width
+        self.height = node_model.height
+        self.hide = node_model.hide
+        self.use_custom_color = node_model.use_custom_color
+        self.color = tuple(node_model.color)
+
+    def save(self):
+        '''generate save dict'''
+        return self.to_model().to_dict()
+
+    def load(self, save_dict, nodes):
+        '''load property from save dict'''
+        self.load_model(model.node_from_dict(self.name, save_dict))
+
+class NodeCustomProperties(Node):
+    '''base of custom properties nodes'''
+
+    # label when owner does not have any custom properties
+    empty_text = ''
+
+    model_type = model.CustomPropertiesNode
+
+    def get_owner(self):
+        '''struct to show custom properties of, None when not set, False when not found'''
+        return None
+
+    def draw_setting(self, layout, name, kwargs):
+        if name == 'bone_name':
+            if self.object_armature is not None:
+                layout.prop_search(self, 'bone_name', self.object_armature.pose, 'bones', text='')
+            else:
+                layout.prop(self, 'bone_name', icon='BONE_DATA', text='')
+        else:
+            super().draw_setting(layout, name, kwargs)
+
+    def to_model(self):
+        node_model = super().to_model()
+        node_model.mode_compact = self.mode_compact
+
+        if isinstance(node_model, model.BoneCustomPropertiesNode):
+            node_model.bone_name = self.bone_name
+
+        return node_model
+
+    def load_model(self, node_model):
+        super().load_model(node_model)
+        self.mode_compact = node_model.mode_compact
+
+        if isinstance(node_model, model.BoneCustomPropertiesNode):
+            self.bone_name = node_model.bone_name
+
+    def build_display_state(self):
+        '''(owner, sorted custom property keys), None when owner is not set'''
+        owner = self.get_owner()
+
+        if owner is None:
+            return None
+
+        # custom properties can not be subscribed with msgbus, redraw when watched datablock is updated
+        watch(self, self.get_watched())
+
+        if owner and owner.get('_RNA_UI', False):
+            return owner, sorted(owner['_RNA_UI'].keys())
+
+        return owner, ()
+
+    def draw_display(self, context, layout, state, is_ext):
+        if state is None:
+            return
+
+        owner, keys = state
+
+        if keys:
+            for key in keys:
+                split = layout.split(factor=0.4)
+                col = split.column()
+                col.alignment = 'RIGHT'
+                col.label(text=key)
+                col = split.column()
+                col.prop(owner, '["' + key + '"]', text='')
+        else:
+            layout.label(text=self.empty_text)
 
 class NodeCategory(OriNodeCategory):
     @classmethod
@@ -15,7 +203,8 @@ node_categories = [
     NodeCategory('NPICK_BONE', "Bone", items=[
         NodeItem("NodeNPickBonePicker"),
         NodeItem("NodeNPickBoneCustomPropertiesPoseBone"),
-        NodeItem("NodeNPickBoneCustomPropertiesBone")
+        NodeItem("NodeNPickBoneCustomPropertiesBone"),
+        NodeItem("NodeNPickPoseSnapshot")
     ]),
     NodeCategory('NPICK_LAYOUT', "Layout", items=[
         NodeItem("NodeFrame")
@@ -26,4 +215,4 @@ def register():
     nodeitems_utils.register_node_categories('NPICK_NODES', node_categories)
 
 def unregister():
-    nodeitems_utils.unregister_node_categories('NPICK_NODES')
\ No newline at end of file
+    nodeitems_utils.unregister_node_categories('NPICK_NODES')
@@ -1,38 +1,17 @@
 import bpy
-from bpy.types import Operator, Node as OriNode, PropertyGroup
+import numpy
+from bpy.types import Operator, PropertyGroup
 from bpy.utils import register_class, unregister_class
-
-class Node(OriNode):
-    @classmethod
-    def poll(cls, ntree):
-        return ntree.bl_idname == 'nPicker'
-
-    def save(self):
-        '''generate base save dict'''
-        save_dict = {
-            "type": self.bl_idname,
-            "label": self.label,
-            "location": list(self.location),
-            "width": self.width,
-            "height": self.height,
-            "hide": self.hide,
-            "parent": self.parent.name if self.parent else None,
-            "use_custom_color": self.use_custom_color,
-            "color": list(self.color),
-        }
-        return save_dict
-
-    def load(self, save_dict, nodes):
-        '''load property from save dict'''
-
-        self.label = save_dict['label']
-        self.location = tuple(save_dict['location'])
-        self.width = save_dict['width']
-        self.height = save_dict['height']
-        self.hide = save_dict['hide']
-        self.parent = nodes[save_dict['parent']]['node'] if save_dict['parent'] else None
-        self.use_custom_color = save_dict['use_custom_color']
-        self.color = tuple(save_dict['color'])
+from .node import Node
+from ..core import model, generate
+from ..core.remap import mirror_picker
+from .selection import SET, ADD, selection_modes, get_mask, apply_mask
+from .selection_set import apply_selection_set
+from .keyframe import key_bones, tag_redraw_animation
+from .armature_cache import get_cache, get_bone_state
+from .draw_cache import invalidate, update_invalidate
+from .redraw import watch
+from .updates import suppress_updates
 
 class NPICK_OP_BASE(Operator):
     bl_options = {'REGISTER', 'UNDO'}
@@ -46,50 +25,51 @@ class PG_picker_row(PropertyGroup):
         default='row'
     )
 
-    object_armature: bpy.props.PointerProperty(
-        type=bpy.types.Object,
-        poll=lambda self, obj: obj.type == "ARMATURE"
+    bone_name: bpy.props.StringProperty(
+        name='bone name',
+        default='',
+        update=update_invalidate
     )
 
-    def update_picker(self, context):
-        if self.picker:
-            # change to false
-            self.picker = False
-
-            if self.object_armature and self.bone_name:
-                # get bone
-                pose_bone = self.object_armature.pose.bones.get(self.bone_name)
-
-                if pose_bone:
-                    if self.mode_select == "SINGLE":
-                        # deselect bone if mode select bone is single
-                        for bone in [pose_bone_to_deselect.bone for pose_bone_to_deselect in self.object_armature.pose.bones if pose_bone_to_deselect is not pose_bone]:
-                            bone.select = False
-
-                    # select bone if exist
-                    pose_bone.bone.select = True
-
-    picker: bpy.props.BoolProperty(
+    show_bone_name: bpy.props.BoolProperty(
+        name='show bone name',
         default=False,
-        update=update_picker
+        update=update_invalidate
     )
 
-    mode_select: bpy.props.EnumProperty(
+    kind: bpy.props.EnumProperty(
+        name='kind',
         items=[
-            ('MULTI', 'Muliple', 'multiple select bone'),
-            ('SINGLE', 'Single', 'single select bone')
+            (model.BONE, 'Bone', 'select bone'),
+            (model.SELECTION_SET, 'Selection Set', 'apply selection set of node tree'),
+            (model.KEY_SELECTION, 'Key Selection', 'keyframe selected bones')
         ],
-        default='SINGLE'
+        default=model.BONE,
+        update=update_invalidate
     )
 
-    bone_name: bpy.props.StringProperty(
-        name='bone name',
+    selection_set: bpy.props.StringProperty(
+        name='selection set',
+        default='',
+        update=update_invalidate
+    )
+
+    selection_mode: bpy.props.EnumProperty(
+        name='selection mode',
+        items=selection_modes,
+        default=SET
+    )
+
+class PG_picker_target(PropertyGroup):
+    '''extra armature binding that picker clicks are applied to'''
+    binding: bpy.props.StringProperty(
+        name='binding',
         default=''
     )
 
-    show_bone_name: bpy.props.BoolProperty(
-        name='show bone name',
-        default=False
+    use: bpy.props.BoolProperty(
+        name='use',
+        default=True
     )
 
 class PG_picker_column(PropertyGroup):
@@ -99,13 +79,18 @@ class PG_picker_column(PropertyGroup):
     )
 
     size: bpy.props.FloatProperty(
-        default=1.0
+        default=1.0,
+        update=update_invalidate
     )
 
     rows: bpy.props.CollectionProperty(
         type=PG_picker_row
     )
 
+def get_row_address(node, index_column, index_row):
+    '''address of picker row for click operator, buttons are drawn in node editor of node tree'''
+    return '%d %d %s' % (index_column, index_row, node.name)
+
 class NODE(Node):
     '''node picker'''
     bl_idname = 'NodeNPickBonePicker'
@@ -114,99 +99,162 @@ class NODE(Node):
     bl_width_default = 250
     bl_width_min = 50
 
+    model_type = model.PickerNode
+
+    setting_props = (
+        ('Armature', 'binding', {}),
+        ('Select Mode', 'mode_select', {'text': ''})
+    )
+
+    # name of armature binding of node tree
+    binding: bpy.props.StringProperty(
+        name='binding',
+        default='',
+        update=update_invalidate
+    )
+
     mode_compact: bpy.props.BoolProperty(
-        default=False
+        default=False,
+        update=update_invalidate
     )
 
     picker_columns: bpy.props.CollectionProperty(
         type=PG_picker_column
     )
 
-    def update_mode_select(self, context):
-        for picker_column in self.picker_columns:
-            for picker_row in picker_column.rows:
-                picker_row.mode_select = self.mode_select
-
-    mode_select: bpy.props.EnumProperty(
-        items=[
-            ('MULTI', 'Muliple', 'multiple select bone'),
-            ('SINGLE', 'Single', 'single select bone')
-        ],
-        default='SINGLE',
-        update=update_mode_select
+    picker_targets: bpy.props.CollectionProperty(
+        type=PG_picker_target
     )
 
-    def update_object_armature(self, context):
-        selected_nodes = [node for node in context.space_data.node_tree.nodes if node.select and node is not self]
+    def get_object_armatures(self):
+        '''armature of node and of used targets, armatures sharing armature data are applied once'''
+        armature_bindings = self.id_data.armature_bindings
+        object_armatures = [self.object_armature]
 
-        for node in selected_nodes:
-            node.select = False
-            if hasattr(node, 'update_object_armature'):
-                node.update_object_armature(context)
+        for picker_target in self.picker_targets:
+            if picker_target.use:
+                binding = armature_bindings.get(picker_target.binding)
+                if binding is not None:
+                    object_armatures.append(binding.object_armature)
 
-        for node in selected_nodes:
-            node.select = True
+        # bone select flags are stored on armature data
+        unique = {}
+        for object_armature in object_armatures:
+            if object_armature is not None:
+                unique.setdefault(object_armature.data.as_pointer(), object_armature)
 
-        if hasattr(self, 'picker_columns'):
-            for picker_column in self.picker_columns:
-                for picker_row in picker_column.rows:
-                    picker_row.object_armature = self.object_armature
+        return list(unique.values())
 
-    object_armature: bpy.props.PointerProperty(
-        type=bpy.types.Object,
-        poll=lambda self, obj: obj.type == "ARMATURE",
-        update=update_object_armature
+    mode_select: bpy.props.EnumProperty(
+        items=[
+            ('MULTI', 'Muliple', 'multiple select bone'),
+            ('SINGLE', 'Single', 'single select bone')
+        ],
+        default='SINGLE'
     )
 
-    def draw_buttons(self, context, layout):
-        if not self.mode_compact:
-            row = layout.row()
-            split = row.split(factor=0.4)
-            col = split.column()
-            col.alignment = 'RIGHT'
-            col.label(text='Object')
-            col.label(text='Select Mode')
-            col.label(text='Custom Color')
-            col.label(text='Color')
-            col = split.column()
-            col.prop(self, 'object_armature', text='')
-            col.prop(self, 'mode_select', text='')
-            col.prop(self, 'use_custom_color', text='')
-            col.prop(self, 'color', text='')
-
-            row = layout.row()
-            row.scale_y = 1.25
-            row.prop(self, 'mode_compact', text='Compact Mode', toggle=True)
-
+    def click_row(self, context, picker_row):
+        '''apply clicked picker row, return error text or None'''
+        if picker_row.kind == model.SELECTION_SET:
+            if picker_row.selection_set:
+                # set is applied to armature of node and of used targets, armature of set binding when node has none
+                return apply_selection_set(self.id_data, picker_row.selection_set, picker_row.selection_mode, self.get_object_armatures())
+
+        elif picker_row.kind == model.KEY_SELECTION:
+            for object_armature in self.get_object_armatures():
+                key_bones(object_armature, get_cache(object_armature).get_select(object_armature.data), context.scene.frame_current)
+            tag_redraw_animation(context)
+
+        elif picker_row.bone_name:
+            # bone index is cached per armature, one selection write per armature
+            for object_armature in self.get_object_armatures():
+                mask = get_mask(object_armature, [picker_row.bone_name])
+
+                # select bone if exist, deselect other bones if mode select bone is single
+                if mask.any():
+                    apply_mask(object_armature, mask, SET if self.mode_select == "SINGLE" else ADD)
+
+        return None
+
+    def get_watched(self):
+        return self.object_armature.data if self.object_armature is not None else None
+
+    def build_display_state(self):
+        '''flatten picker columns to ((column index, size, ((text, emboss, sidebar text, icon, is visible, row address), ...)), ...)'''
+        if self.object_armature is not None:
+            armature = self.object_armature.data
+            watch(self, armature, is_bone_state=True)
+            cache, select, hidden, active = get_bone_state(armature)
+        else:
+            cache = None
+
+        def get_button(picker_row):
+            if picker_row.kind == model.SELECTION_SET:
+                return (picker_row.selection_set or ' ', bool(picker_row.selection_set), picker_row.selection_set or ' ', 'GROUP_BONE', True)
+
+            if picker_row.kind == model.KEY_SELECTION:
+                return ('Key', True, 'Key', 'KEY_HLT', True)
+
+            bone_name = picker_row.bone_name
+            icon = 'NONE'
+            is_visible = True
+
+            # bone state from bulk read, rebuilt when armature data changes
+            index = cache.indices.get(bone_name) if cache is not None and bone_name else None
+            if index is not None:
+                if bone_name == active:
+                    icon = 'PMARKER_ACT'
+                elif select[index]:
+                    icon = 'LAYER_ACTIVE'
+                is_visible = not hidden[index]
+
+            return (bone_name if bone_name and picker_row.show_bone_name else ' ', bool(bone_name), bone_name or ' ', icon, is_visible)
+
+        # row address of click operator is packed once here, draw writes one operator property per button
+        return tuple(
+            (index, picker_column.size, tuple(get_button(picker_row) + (get_row_address(self, index, index_row),) for index_row, picker_row in enumerate(picker_column.rows)))
+            for index, picker_column in enumerate(self.picker_columns)
+        )
+
+    def draw_display(self, context, layout, state, is_ext):
+        if is_ext:
+            self.draw_display_ext(context, layout, state)
+            return
+
+        # replay display state
         col = layout.column()
-        for index, picker_column in enumerate(self.picker_columns):
+        for index, size, buttons in state:
 
-            if picker_column.rows:
+            if buttons:
 
                 row = col.row()
-                row.scale_y = picker_column.size
-
-                for picker_row in picker_column.rows:
-                    row.prop(picker_row, 'picker', text=picker_row.bone_name if bool(picker_row.bone_name) and picker_row.show_bone_name else ' ', expand=True, toggle=True, emboss=bool(picker_row.bone_name))
-
-    def draw_buttons_ext(self, context, layout):
-        row = layout.row()
-        split = row.split(factor=0.4)
-        col = split.column()
-        col.alignment = 'RIGHT'
-        col.label(text='Object')
-        col.label(text='Select Mode')
-        col.label(text='Custom Color')
-        col.label(text='Color')
-        col = split.column()
-        col.prop(self, 'object_armature', text='')
-        col.prop(self, 'mode_select', text='')
-        col.prop(self, 'use_custom_color', text='')
-        col.prop(self, 'color', text='')
+                row.scale_y = size
+
+                for text, emboss, ext_text, icon, is_visible, row_address in buttons:
+                    # gray out bones on hidden layers
+                    sub = row
+                    if not is_visible:
+                        sub = row.row()
+                        sub.active = False
+                    sub.operator('npick.click_row_picker', text=text, icon=icon, emboss=emboss).row_address = row_address
+
+    def draw_targets(self, layout):
+        col = layout.column(align=True)
+        col.label(text='Targets')
+        for index, picker_target in enumerate(self.picker_targets):
+            row = col.row(align=True)
+            row.prop(picker_target, 'use', text='')
+            row.prop_search(picker_target, 'binding', self.id_data, 'armature_bindings', text='', icon='LINKED')
+            op = row.operator('npick.remove_picker_target', text='', icon='REMOVE')
+            op.node_tree_name = self.id_data.name
+            op.node_object_name = self.name
+            op.index = index
+        op = col.operator('npick.add_picker_target', icon='ADD')
+        op.node_tree_name = self.id_data.name
+        op.node_object_name = self.name
 
-        row = layout.row()
-        row.scale_y = 1.25
-        row.prop(self, 'mode_compact', text='Compact Mode', toggle=True)
+    def draw_display_ext(self, context, layout, state):
+        self.draw_targets(layout)
 
         row = layout.row()
         op = row.operator('npick.add_column_picker')
@@ -214,11 +262,12 @@ class NODE(Node):
         op.node_object_name = self.name
         op.is_append = False
 
+        picker_columns = self.picker_columns
         col = layout.column()
-        for index, picker_column in enumerate(self.picker_columns):
+        for index, size, buttons in state:
 
             row = col.row(align=True)
-            row.prop(picker_column, 'size')
+            row.prop(picker_columns[index], 'size')
             op = row.operator('npick.remove_column_picker', text='column', icon='REMOVE')
             op.node_tree_name = self.id_data.name
             op.node_object_name = self.name
@@ -228,20 +277,19 @@ class NODE(Node):
             op.node_object_name = self.name
             op.index = index
 
-            if picker_column.rows:
+            if buttons:
 
                 row = col.row()
-                row.scale_y = picker_column.size
+                row.scale_y = size
 
-                for index_row, picker_row in enumerate(picker_column.rows):
-                    # row.prop(picker_row, 'picker', text=' ', icon=('LAYER_USED' if picker_row.bone_name else 'BLANK1'), expand=True, toggle=True)
-                    op = row.operator('npick.popup_row_picker', text=picker_row.bone_name if bool(picker_row.bone_name) else ' ')
+                for index_row, (text, emboss, ext_text, icon, is_visible, row_address) in enumerate(buttons):
+                    op = row.operator('npick.popup_row_picker', text=ext_text)
                     op.node_tree_name = self.id_data.name
                     op.node_object_name = self.name
                     op.index_column = index
                     op.index_row = index_row
 
-        if self.picker_columns:
+        if state:
             row = layout.row()
             op = row.operator('npick.add_column_picker')
             op.node_tree_name = self.id_data.name
@@ -251,38 +299,34 @@ class NODE(Node):
     def draw_label(self):
         return "Picker"
 
-    def save(self):
-        '''generate save dict'''
-
-        # get basic dict
-        save_dict = super().save()
-
-        save_dict['mode_compact'] =  self.mode_compact
-        save_dict['mode_select'] =  self.mode_select
-        save_dict['picker_columns'] =  [{'size': col.size, 'rows': [{'bone_name': row.bone_name, 'show_bone_name': row.show_bone_name} for row in col.rows]} for col in self.picker_columns]
-
-        return save_dict
+    def to_model(self):
+        node_model = super().to_model()
+        node_model.mode_compact = self.mode_compact
+        node_model.mode_select = self.mode_select
+        node_model.columns = [model.PickerColumn(col.size, [model.PickerRow(row.bone_name, row.show_bone_name, row.kind, row.selection_set, row.selection_mode) for row in col.rows]) for col in self.picker_columns]
+        return node_model
 
-    def load(self, save_dict, nodes):
-        '''load property from save dict'''
-
-        # set basic dict
-        super().load(save_dict, nodes)
-
-        self.mode_compact = save_dict['mode_compact']
-        self.mode_select = save_dict['mode_select']
+    def load_model(self, node_model):
+        super().load_model(node_model)
+        self.mode_compact = node_model.mode_compact
+        self.mode_select = node_model.mode_select
 
         # clear collection
         self.picker_columns.clear()
 
-        for col_data in save_dict['picker_columns']:
+        for col_model in node_model.columns:
             new_col = self.picker_columns.add()
-            new_col.size = col_data['size']
+            new_col.size = col_model.size
 
-            for row_data in col_data['rows']:
+            for row_model in col_model.rows:
                 new_row = new_col.rows.add()
-                new_row.bone_name = row_data['bone_name']
-                new_row.show_bone_name = row_data['show_bone_name']
+                new_row.bone_name = row_model.bone_name
+                new_row.show_bone_name = row_model.show_bone_name
+                new_row.kind = row_model.kind
+                new_row.selection_set = row_model.selection_set
+                new_row.selection_mode = row_model.selection_mode
+
+        invalidate(self)
 
 class NPICK_OP_add_column_picker(NPICK_OP_BASE):
     """add column on picker node"""
@@ -301,17 +345,13 @@ class NPICK_OP_add_column_picker(NPICK_OP_BASE):
         new_col = node.picker_columns.add()
 
         # add one row
-        new_row = new_col.rows.add()
-
-        # set current select mode
-        new_row.mode_select = node.mode_select
-
-        # set current object armature
-        new_row.object_armature = node.object_armature
+        new_col.rows.add()
 
         if not self.is_append:
             node.picker_columns.move((len(node.picker_columns) - 1), 0)
 
+        invalidate(node)
+
         return {'FINISHED'}
 
 class NPICK_OP_remove_column_picker(NPICK_OP_BASE):
@@ -330,6 +370,8 @@ class NPICK_OP_remove_column_picker(NPICK_OP_BASE):
         # remove column
         node.picker_columns.remove(self.index)
 
+        invalidate(node)
+
         return {'FINISHED'}
 
 class NPICK_OP_add_row_picker(NPICK_OP_BASE):
@@ -347,13 +389,9 @@ class NPICK_OP_add_row_picker(NPICK_OP_BASE):
 
         # add row to column
         picker_column = node.picker_columns[self.index]
-        picker_row = picker_column.rows.add()
-
-        # set current select mode
-        picker_row.mode_select = node.mode_select
+        picker_column.rows.add()
 
-        # set current object armature
-        picker_row.object_armature = node.object_armature
+        invalidate(node)
 
         return {'FINISHED'}
 
@@ -375,6 +413,72 @@ class NPICK_OP_remove_row_picker(NPICK_OP_BASE):
         picker_column = node.picker_columns[self.index_column]
         picker_column.rows.remove(self.index_row)
 
+        invalidate(node)
+
+        return {'FINISHED'}
+
+class NPICK_OP_add_picker_target(NPICK_OP_BASE):
+    """add armature binding that picker clicks are also applied to"""
+    bl_idname = "npick.add_picker_target"
+    bl_label = "add target"
+
+    node_tree_name: bpy.props.StringProperty(default="")
+    node_object_name: bpy.props.StringProperty(default="")
+
+    def execute(self, context):
+        # get node
+        node = bpy.data.node_groups[self.node_tree_name].nodes[self.node_object_name]
+
+        # first binding that is not used by node yet
+        used = {node.binding} | {picker_target.binding for picker_target in node.picker_targets}
+        picker_target = node.picker_targets.add()
+        picker_target.binding = next((binding.name for binding in node.id_data.armature_bindings if binding.name not in used), '')
+
+        return {'FINISHED'}
+
+class NPICK_OP_remove_picker_target(NPICK_OP_BASE):
+    """remove picker target"""
+    bl_idname = "npick.remove_picker_target"
+    bl_label = "remove target"
+
+    node_tree_name: bpy.props.StringProperty(default="")
+    node_object_name: bpy.props.StringProperty(default="")
+    index: bpy.props.IntProperty(default=-1)
+
+    def execute(self, context):
+        # get node
+        node = bpy.data.node_groups[self.node_tree_name].nodes[self.node_object_name]
+
+        if not 0 <= self.index < len(node.picker_targets):
+            return {'CANCELLED'}
+
+        node.picker_targets.remove(self.index)
+
+        return {'FINISHED'}
+
+class NPICK_OP_click_row_picker(NPICK_OP_BASE):
+    """select bone, apply selection set or keyframe selected bones of picker row"""
+    bl_idname = "npick.click_row_picker"
+    bl_label = "click row picker"
+
+    # "column index row index node name" from get_row_address, one property write per drawn button
+    row_address: bpy.props.StringProperty(
+        default="",
+        options={'HIDDEN'}
+    )
+
+    def execute(self, context):
+        # get node, rows are addressed by index, row property groups can not resolve their node
+        index_column, index_row, node_object_name = self.row_address.split(' ', 2)
+        node = context.space_data.node_tree.nodes[node_object_name]
+        picker_row = node.picker_columns[int(index_column)].rows[int(index_row)]
+
+        error = node.click_row(context, picker_row)
+
+        if error:
+            self.report({'ERROR'}, error)
+            return {'CANCELLED'}
+
         return {'FINISHED'}
 
 class NPICK_OP_popup_row_picker(NPICK_OP_BASE):
@@ -413,7 +517,35 @@ class NPICK_OP_popup_row_picker(NPICK_OP_BASE):
         default=False
     )
 
+    kind: bpy.props.EnumProperty(
+        name='kind',
+        items=[
+            (model.BONE, 'Bone', 'select bone'),
+            (model.SELECTION_SET, 'Selection Set', 'apply selection set of node tree'),
+            (model.KEY_SELECTION, 'Key Selection', 'keyframe selected bones')
+        ],
+        default=model.BONE
+    )
+
+    selection_set: bpy.props.StringProperty(
+        name='set',
+        default=''
+    )
+
+    selection_mode: bpy.props.EnumProperty(
+        name='mode',
+        items=selection_modes,
+        default=SET
+    )
+
     def invoke(self, context, event):
+        # start from current row
+        picker_row = bpy.data.node_groups[self.node_tree_name].nodes[self.node_object_name].picker_columns[self.index_column].rows[self.index_row]
+        self.kind = picker_row.kind
+        self.selection_set = picker_row.selection_set
+        self.selection_mode = picker_row.selection_mode
+        self.show_bone_name = picker_row.show_bone_name
+
         active_pose_bone = context.active_pose_bone
         self.bone_name = active_pose_bone.name if active_pose_bone else "bone"
         return context.window_manager.invoke_props_dialog(self, width = 250)
@@ -423,8 +555,13 @@ class NPICK_OP_popup_row_picker(NPICK_OP_BASE):
 
         col = layout.column()
 
-        col.prop(self, 'bone_name')
-        col.prop(self, 'show_bone_name')
+        col.prop(self, 'kind', expand=True)
+        if self.kind == model.SELECTION_SET:
+            col.prop_search(self, 'selection_set', bpy.data.node_groups[self.node_tree_name], 'selection_sets')
+            col.prop(self, 'selection_mode')
+        elif self.kind == model.BONE:
+            col.prop(self, 'bone_name')
+            col.prop(self, 'show_bone_name')
 
         row = layout.row()
         op = row.operator('npick.remove_row_picker')
@@ -440,19 +577,188 @@ class NPICK_OP_popup_row_picker(NPICK_OP_BASE):
         # get row picker
         picker_row = node.picker_columns[self.index_column].rows[self.index_row]
 
-        picker_row.bone_name = self.bone_name
-        picker_row.show_bone_name = self.show_bone_name
+        picker_row.kind = self.kind
+
+        if self.kind == model.SELECTION_SET:
+            picker_row.selection_set = self.selection_set
+            picker_row.selection_mode = self.selection_mode
+        elif self.kind == model.BONE:
+            picker_row.bone_name = self.bone_name
+            picker_row.show_bone_name = self.show_bone_name
+
+        return {'FINISHED'}
+
+def get_absolute_location(node):
+    '''location of node in node tree space, location of parented node is relative to parent'''
+    x, y = node.location
+    parent = node.parent
+    while parent:
+        x += parent.location[0]
+        y += parent.location[1]
+        parent = parent.parent
+    return [x, y]
+
+class NPICK_OP_mirror_picker(NPICK_OP_BASE):
+    """create mirrored picker node of selected picker nodes, bones are renamed to the opposite side"""
+    bl_idname = "npick.mirror_picker"
+    bl_label = "mirror picker"
+
+    axis: bpy.props.FloatProperty(
+        name='Axis',
+        description='x location in node editor to mirror around',
+        default=0.0
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return super().poll(context) and any(hasattr(node, 'picker_columns') for node in context.selected_nodes)
+
+    def execute(self, context):
+        nodes = context.space_data.node_tree.nodes
+        picker_nodes = [node for node in context.selected_nodes if hasattr(node, 'picker_columns')]
+        new_nodes = []
+
+        with suppress_updates():
+            for node in picker_nodes:
+                # mirror core model then build node in one pass
+                node_model = node.to_model()
+                node_model.location = get_absolute_location(node)
+                mirror_picker(node_model, self.axis)
+
+                new_node = nodes.new(node.bl_idname)
+                new_node.name = node_model.name
+                new_node.binding = node.binding
+                new_node.load_model(node_model)
+
+                # mirrored picker drives the same armatures
+                for picker_target in node.picker_targets:
+                    new_target = new_node.picker_targets.add()
+                    new_target.binding = picker_target.binding
+                    new_target.use = picker_target.use
+                new_nodes.append(new_node)
+
+        invalidate(context.space_data.node_tree)
+
+        # select new nodes
+        for node in picker_nodes:
+            node.select = False
+        for node in new_nodes:
+            node.select = True
+
+        return {'FINISHED'}
+
+class NPICK_OP_generate_picker(NPICK_OP_BASE):
+    """generate picker nodes from bones of armature"""
+    bl_idname = "npick.generate_picker"
+    bl_label = "generate picker"
+
+    object_armature_name: bpy.props.StringProperty(
+        name='Armature',
+        default=''
+    )
+
+    group_by: bpy.props.EnumProperty(
+        name='Group By',
+        items=[
+            ('LAYER', 'Layer', 'one picker node per bone layer'),
+            ('GROUP', 'Bone Group', 'one picker node per bone group'),
+            ('DEPTH', 'Depth', 'one picker node per hierarchy depth')
+        ],
+        default='LAYER'
+    )
+
+    buttons_per_column: bpy.props.IntProperty(
+        name='Buttons Per Column',
+        default=8,
+        min=1
+    )
+
+    nodes_per_row: bpy.props.IntProperty(
+        name='Nodes Per Row',
+        default=4,
+        min=1
+    )
+
+    def invoke(self, context, event):
+        if context.object and context.object.type == 'ARMATURE':
+            self.object_armature_name = context.object.name
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def draw(self, context):
+        layout = self.layout
+
+        col = layout.column()
+        col.prop_search(self, 'object_armature_name', bpy.data, 'objects')
+        col.prop(self, 'group_by')
+        col.prop(self, 'buttons_per_column')
+        col.prop(self, 'nodes_per_row')
+
+    def get_groups(self, object_armature):
+        '''[(label, bone names)] read from armature in one pass'''
+        bones = object_armature.data.bones
+        names = bones.keys()
+
+        if self.group_by == 'LAYER':
+            layers = numpy.zeros(len(names) * 32, dtype=bool)
+            bones.foreach_get('layers', layers)
+            return generate.group_by_layer(names, layers.reshape(-1, 32).tolist())
+
+        if self.group_by == 'GROUP':
+            pose_bones = object_armature.pose.bones
+            return generate.group_by_key(names, [pose_bones[name].bone_group.name if pose_bones[name].bone_group else None for name in names], 'No Group')
+
+        depths = generate.get_depths(names, [bone.parent.name if bone.parent else None for bone in bones])
+        return sorted(generate.group_by_key(names, ['Depth ' + str(depth) for depth in depths], 'Depth 0'), key=lambda group: int(group[0].split()[1]))
+
+    def execute(self, context):
+        object_armature = bpy.data.objects.get(self.object_armature_name)
+
+        if object_armature is None or object_armature.type != 'ARMATURE':
+            self.report({'ERROR'}, "SELECT ARMATURE")
+            return {'CANCELLED'}
+
+        node_tree = context.space_data.node_tree
+        node_models = generate.layout_pickers(self.get_groups(object_armature), self.buttons_per_column, self.nodes_per_row)
+
+        # place below existing nodes
+        offset_y = min((node.location[1] - node.dimensions[1] for node in node_tree.nodes if not node.parent), default=0.0) - 100.0
+
+        with suppress_updates():
+            frame = node_tree.nodes.new('NodeFrame')
+            frame.label = object_armature.name
+            frame.location = (0.0, offset_y)
+
+            for node in node_tree.nodes:
+                node.select = False
+
+            for node_model in node_models:
+                new_node = node_tree.nodes.new(node_model.type)
+                new_node.object_armature = object_armature
+                new_node.load_model(node_model)
+                new_node.parent = frame
+                new_node.location = tuple(node_model.location)
+                new_node.select = True
+
+        invalidate(node_tree)
+
+        self.report({'INFO'}, "%d PICKER NODES" % len(node_models))
 
         return {'FINISHED'}
 
 classes = [
     PG_picker_row,
+    PG_picker_target,
     PG_picker_column,
     NPICK_OP_add_column_picker,
     NPICK_OP_remove_column_picker,
     NPICK_OP_add_row_picker,
     NPICK_OP_remove_row_picker,
+    NPICK_OP_add_picker_target,
+    NPICK_OP_remove_picker_target,
+    NPICK_OP_click_row_picker,
     NPICK_OP_popup_row_picker,
+    NPICK_OP_mirror_picker,
+    NPICK_OP_generate_picker,
     NODE
 ]
 
@@ -1,47 +1,17 @@
 import bpy
-from bpy.types import Node as OriNode, PropertyGroup
+from bpy.types import PropertyGroup
 from bpy.utils import register_class, unregister_class
-
-class Node(OriNode):
-    @classmethod
-    def poll(cls, ntree):
-        return ntree.bl_idname == 'nPicker'
-
-    def save(self):
-        '''generate base save dict'''
-        save_dict = {
-            "type": self.bl_idname,
-            "label": self.label,
-            "location": list(self.location),
-            "width": self.width,
-            "height": self.height,
-            "hide": self.hide,
-            "parent": self.parent.name if self.parent else None,
-            "use_custom_color": self.use_custom_color,
-            "color": list(self.color),
-        }
-        return save_dict
-
-    def load(self, save_dict, nodes):
-        '''load property from save dict'''
-
-        self.label = save_dict['label']
-        self.location = tuple(save_dict['location'])
-        self.width = save_dict['width']
-        self.height = save_dict['height']
-        self.hide = save_dict['hide']
-        self.parent = nodes[save_dict['parent']]['node'] if save_dict['parent'] else None
-        self.use_custom_color = save_dict['use_custom_color']
-        self.color = tuple(save_dict['color'])
+from .node import Node
+from ..core import model
+from .armature_cache import get_cache
+from .draw_cache import update_invalidate
+from .redraw import subscribe
 
 class PG_bone_layer(PropertyGroup):
     name: bpy.props.StringProperty(
         name='name',
         default='layer'
     )
-    has_bone: bpy.props.BoolProperty(
-        default=True
-    )
     dummy_boolean: bpy.props.BoolProperty(
         default=False
     )
@@ -53,176 +23,98 @@ class NODE(Node):
     bl_icon = 'LONGDISPLAY'
     bl_width_default = 250
 
-    mode_compact: bpy.props.BoolProperty(
-        default=False
-    )
-
-    def update_object_armature(self, context):
-        selected_nodes = [node for node in context.space_data.node_tree.nodes if node.select and node is not self]
+    model_type = model.LayerNode
 
-        for node in selected_nodes:
-            node.select = False
-            if hasattr(node, 'update_object_armature'):
-                node.update_object_armature(context)
+    setting_props = (
+        ('Armature', 'binding', {}),
+        ('Filter', 'layer_with_bone', {'text': 'Layer With Bone', 'toggle': True})
+    )
 
-        for node in selected_nodes:
-            node.select = True
+    # name of armature binding of node tree
+    binding: bpy.props.StringProperty(
+        name='binding',
+        default='',
+        update=update_invalidate
+    )
 
-        if hasattr(self, 'collection_bone_layers'):
-            if self.object_armature is not None:
-                # check bones
-                for index, bone_layer in enumerate(self.collection_bone_layers):
-                    bone_layer.has_bone = any([bone.layers[index] for bone in self.object_armature.data.bones])
-            else:
-                # reset has_bone attribute
-                for bone_layer in self.collection_bone_layers:
-                    bone_layer.has_bone = True
-
-    object_armature: bpy.props.PointerProperty(
-        type=bpy.types.Object,
-        poll=lambda self, obj: obj.type == "ARMATURE",
-        update=update_object_armature
+    mode_compact: bpy.props.BoolProperty(
+        default=False
     )
 
     layer_with_bone: bpy.props.BoolProperty(
-        default=False
+        default=False,
+        update=update_invalidate
     )
 
     collection_bone_layers: bpy.props.CollectionProperty(
         type=PG_bone_layer
     )
 
+    def get_layer_mask(self):
+        '''32 bit mask of layers that have bones, every layer without armature'''
+        if self.object_armature is not None:
+            return get_cache(self.object_armature).get_layer_mask(self.object_armature.data)
+        return 0xFFFFFFFF
+
     def init(self, context):
         for index in range(32):
             bone_layer = self.collection_bone_layers.add()
             bone_layer.name = 'Layer ' + str(index + 1)
 
-    def draw_buttons(self, context, layout):
-        if not self.mode_compact:
-            row = layout.row()
-            split = row.split(factor=0.4)
-            col = split.column()
-            col.alignment = 'RIGHT'
-            col.label(text='Object')
-            col.label(text='Filter')
-            col.label(text='Custom Color')
-            col.label(text='Color')
-            col = split.column()
-            col.prop(self, 'object_armature', text='')
-            col.prop(self, 'layer_with_bone', text='Layer With Bone', toggle=True)
-            col.prop(self, 'use_custom_color', text='')
-            col.prop(self, 'color', text='')
-
-            row = layout.row()
-            row.scale_y = 1.25
-            row.prop(self, 'mode_compact', text='Compact Mode', toggle=True)
+    def get_watched(self):
+        return self.object_armature.data if self.object_armature is not None else None
+
+    def build_display_state(self):
+        '''((layer index, visibility icon), ...) of shown layers, icon is None without armature'''
+        layer_mask = self.get_layer_mask() if self.layer_with_bone else 0xFFFFFFFF
+
+        if self.object_armature is not None:
+            # redraw when layer visibility changes outside node editor
+            subscribe(self, self.object_armature.data, 'layers')
+            layers = self.object_armature.data.layers
+            return tuple((index, 'HIDE_OFF' if layers[index] else 'HIDE_ON') for index in range(32) if layer_mask >> index & 1)
 
+        return tuple((index, None) for index in range(32) if layer_mask >> index & 1)
+
+    def draw_display(self, context, layout, state, is_ext):
         row = layout.row()
         col = row.column(align=True)
         col.scale_y = 1.25
 
-        # filter layer that has bones
-        filter_layers = [bone_layer for bone_layer in self.collection_bone_layers if bone_layer.has_bone]
+        collection_bone_layers = self.collection_bone_layers
 
-        for index, bone_layer in enumerate((filter_layers if self.layer_with_bone else self.collection_bone_layers)):
+        for count, (index, icon) in enumerate(state):
 
-            if self.width > 300 and index in ([8, 16, 24] if self.width > 500 else [16]):
+            if not is_ext and self.width > 300 and count in ([8, 16, 24] if self.width > 500 else [16]):
                 col = row.column(align=True)
                 col.scale_y = 1.25
 
-            if self.layer_with_bone:
-                if bone_layer.has_bone:
-                    sub_row = col.row(align=True)
-                    if self.object_armature is not None:
-                        sub_row.prop(self.object_armature.data, 'layers', text='', toggle=True, icon='HIDE_OFF' if self.object_armature.data.layers[index] else 'HIDE_ON', index=index)
-                    else:
-                        disableRow = sub_row.row(align=True)
-                        disableRow.enabled = False
-                        disableRow.prop(bone_layer, 'dummy_boolean', text='', toggle=True, icon='HIDE_ON')
-                    sub_row.prop(bone_layer, 'name', text='')
+            bone_layer = collection_bone_layers[index]
+            sub_row = col.row(align=True)
+            if icon is not None:
+                sub_row.prop(self.object_armature.data, 'layers', text='', toggle=True, icon=icon, index=index)
             else:
-                sub_row = col.row(align=True)
-                if self.object_armature is not None:
-                    sub_row.prop(self.object_armature.data, 'layers', text='', toggle=True, icon='HIDE_OFF' if self.object_armature.data.layers[index] else 'HIDE_ON', index=index)
-                else:
-                    disableRow = sub_row.row(align=True)
-                    disableRow.enabled = False
-                    disableRow.prop(bone_layer, 'dummy_boolean', text='', toggle=True, icon='HIDE_ON')
-                sub_row.prop(bone_layer, 'name', text='')
-
-    def draw_buttons_ext(self, context, layout):
-        row = layout.row()
-        split = row.split(factor=0.4)
-        col = split.column()
-        col.alignment = 'RIGHT'
-        col.label(text='Object')
-        col.label(text='Filter')
-        col.label(text='Custom Color')
-        col.label(text='Color')
-        col = split.column()
-        col.prop(self, 'object_armature', text='')
-        col.prop(self, 'layer_with_bone', text='Layer With Bone', toggle=True)
-        col.prop(self, 'use_custom_color', text='')
-        col.prop(self, 'color', text='')
-
-        row = layout.row()
-        row.scale_y = 1.25
-        row.prop(self, 'mode_compact', text='Compact Mode', toggle=True)
-
-        row = layout.row()
-        col = row.column(align=True)
-        col.scale_y = 1.25
-
-        # filter layer that has bones
-        filter_layers = [bone_layer for bone_layer in self.collection_bone_layers if bone_layer.has_bone]
-
-        for index, bone_layer in enumerate((filter_layers if self.layer_with_bone else self.collection_bone_layers)):
-
-            if self.layer_with_bone:
-                if bone_layer.has_bone:
-                    sub_row = col.row(align=True)
-                    if self.object_armature is not None:
-                        sub_row.prop(self.object_armature.data, 'layers', text='', toggle=True, icon='HIDE_OFF' if self.object_armature.data.layers[index] else 'HIDE_ON', index=index)
-                    else:
-                        disableRow = sub_row.row(align=True)
-                        disableRow.enabled = False
-                        disableRow.prop(bone_layer, 'dummy_boolean', text='', toggle=True, icon='HIDE_ON')
-                    sub_row.prop(bone_layer, 'name', text='')
-            else:
-                sub_row = col.row(align=True)
-                if self.object_armature is not None:
-                    sub_row.prop(self.object_armature.data, 'layers', text='', toggle=True, icon='HIDE_OFF' if self.object_armature.data.layers[index] else 'HIDE_ON', index=index)
-                else:
-                    disableRow = sub_row.row(align=True)
-                    disableRow.enabled = False
-                    disableRow.prop(bone_layer, 'dummy_boolean', text='', toggle=True, icon='HIDE_ON')
-                sub_row.prop(bone_layer, 'name', text='')
+                disableRow = sub_row.row(align=True)
+                disableRow.enabled = False
+                disableRow.prop(bone_layer, 'dummy_boolean', text='', toggle=True, icon='HIDE_ON')
+            sub_row.prop(bone_layer, 'name', text='')
 
     def draw_label(self):
         return "Bone Layer"
 
-    def save(self):
-        '''generate save dict'''
-
-        # get basic dict
-        save_dict = super().save()
-
-        save_dict['mode_compact'] =  self.mode_compact
-        save_dict['layer_with_bone'] =  self.layer_with_bone
-        save_dict['collection_bone_layers'] =  [layer.name for layer in self.collection_bone_layers]
-
-        return save_dict
-
-    def load(self, save_dict, nodes):
-        '''load property from save dict'''
-
-        # set basic dict
-        super().load(save_dict, nodes)
+    def to_model(self):
+        node_model = super().to_model()
+        node_model.mode_compact = self.mode_compact
+        node_model.layer_with_bone = self.layer_with_bone
+        node_model.layer_names = [layer.name for layer in self.collection_bone_layers]
+        return node_model
 
-        self.mode_compact = save_dict['mode_compact']
-        self.layer_with_bone = save_dict['layer_with_bone']
+    def load_model(self, node_model):
+        super().load_model(node_model)
+        self.mode_compact = node_model.mode_compact
+        self.layer_with_bone = node_model.layer_with_bone
 
-        for index, layer_name in enumerate(save_dict['collection_bone_layers']):
+        for index, layer_name in enumerate(node_model.layer_names):
             self.collection_bone_layers[index].name = layer_name
 
 classes = [
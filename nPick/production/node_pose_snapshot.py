@@ -0,0 +1,315 @@
+import base64
+import bpy
+import numpy
+from bpy.types import Operator
+from bpy.utils import register_class, unregister_class
+from .node import Node
+from ..core import model
+from .armature_cache import get_pose_indices
+from .pose import channel_width, quaternion_columns, read_pose, write_pose
+from .draw_cache import invalidate, update_invalidate
+from .updates import is_suppressed
+
+class NPICK_OP_BASE(Operator):
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, context):
+        return context.space_data.type == "NODE_EDITOR" and context.space_data.tree_type == "nPicker" and context.space_data.node_tree is not None
+
+def pack(values):
+    return base64.b64encode(values.astype(numpy.float32).tobytes()).decode('ascii')
+
+def unpack(data):
+    return numpy.frombuffer(base64.b64decode(data), dtype=numpy.float32).reshape(-1, channel_width)
+
+def get_snapshot(snapshot):
+    '''(bone names, values) of stored pose snapshot'''
+    return snapshot.bone_names.split('\n') if snapshot.bone_names else [], unpack(snapshot.data)
+
+def blend_snapshots(snapshot_a, snapshot_b, factor):
+    '''(bone names, values) blended from a to b by factor, bones that are only in one snapshot are skipped'''
+    names_a, values_a = snapshot_a
+    names_b, values_b = snapshot_b
+    indices_b = {name: index for index, name in enumerate(names_b)}
+    common = [(index, indices_b[name]) for index, name in enumerate(names_a) if name in indices_b]
+
+    if not common:
+        return [], numpy.zeros((0, channel_width), dtype=numpy.float32)
+
+    rows_a, rows_b = (numpy.array(rows) for rows in zip(*common))
+    values_a = values_a[rows_a]
+    values_b = values_b[rows_b].copy()
+
+    # shortest path for quaternion, normalized linear interpolation
+    quaternion_a = values_a[:, quaternion_columns]
+    quaternion_b = values_b[:, quaternion_columns]
+    quaternion_b[(quaternion_a * quaternion_b).sum(axis=1) < 0] *= -1
+
+    values = values_a + (values_b - values_a) * factor
+    quaternion = values[:, quaternion_columns]
+    length = numpy.linalg.norm(quaternion, axis=1)
+    length[length == 0] = 1
+    values[:, quaternion_columns] = quaternion / length[:, None]
+
+    return [names_a[index] for index, index_b in common], values
+
+def apply_snapshot(object_armature, bone_names, values):
+    '''restore bones of snapshot, other bones keep their pose, returns number of bones restored'''
+    indices = get_pose_indices(object_armature)
+    found = [(row, indices[name]) for row, name in enumerate(bone_names) if name in indices]
+
+    if not found:
+        return 0
+
+    rows, targets = (numpy.array(items) for items in zip(*found))
+    pose = read_pose(object_armature)
+    pose[targets] = values[rows]
+    write_pose(object_armature, pose)
+
+    return len(found)
+
+class NODE(Node):
+    '''node pose snapshot'''
+    bl_idname = 'NodeNPickPoseSnapshot'
+    bl_label = 'Pose Snapshot'
+    bl_icon = 'ARMATURE_DATA'
+    bl_width_default = 250
+
+    model_type = model.PoseSnapshotNode
+
+    setting_props = (
+        ('Armature', 'binding', {}),
+        ('Bones', 'source', {'text': ''}),
+        ('Picker', 'picker_name', {'text': ''})
+    )
+
+    # name of armature binding of node tree
+    binding: bpy.props.StringProperty(
+        name='binding',
+        default='',
+        update=update_invalidate
+    )
+
+    mode_compact: bpy.props.BoolProperty(
+        default=False
+    )
+
+    source: bpy.props.EnumProperty(
+        items=[
+            ('ALL', 'All Bones', 'capture every bone of armature'),
+            ('PICKER', 'Picker Bones', 'capture bones of picker node')
+        ],
+        default='ALL'
+    )
+
+    picker_name: bpy.props.StringProperty(
+        name='picker',
+        default=''
+    )
+
+    snapshot_a: bpy.props.StringProperty(
+        name='A',
+        default=''
+    )
+
+    snapshot_b: bpy.props.StringProperty(
+        name='B',
+        default=''
+    )
+
+    def update_factor(self, context):
+        if is_suppressed():
+            return
+
+        node_tree = self.id_data
+        snapshot_a = node_tree.pose_snapshots.get(self.snapshot_a)
+        snapshot_b = node_tree.pose_snapshots.get(self.snapshot_b)
+
+        if self.object_armature is not None and snapshot_a is not None and snapshot_b is not None:
+            apply_snapshot(self.object_armature, *blend_snapshots(get_snapshot(snapshot_a), get_snapshot(snapshot_b), self.factor))
+
+    factor: bpy.props.FloatProperty(
+        name='Blend',
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR',
+        update=update_factor
+    )
+
+    def draw_setting(self, layout, name, kwargs):
+        if name == 'picker_name':
+            layout.prop_search(self, 'picker_name', self.id_data, 'nodes', text='')
+        else:
+            super().draw_setting(layout, name, kwargs)
+
+    def get_bone_names(self):
+        '''names of bones to capture'''
+        if self.source == 'PICKER':
+            picker = self.id_data.nodes.get(self.picker_name)
+            if picker is None or not hasattr(picker, 'picker_columns'):
+                return []
+            return list(dict.fromkeys(picker_row.bone_name for picker_column in picker.picker_columns for picker_row in picker_column.rows if picker_row.bone_name))
+
+        return [pose_bone.name for pose_bone in self.object_armature.pose.bones]
+
+    def capture(self, name):
+        '''store local transforms of bones to pose snapshot of tree, returns snapshot'''
+        indices = get_pose_indices(self.object_armature)
+        bone_names = [bone_name for bone_name in self.get_bone_names() if bone_name in indices]
+        values = read_pose(self.object_armature)[[indices[bone_name] for bone_name in bone_names]]
+
+        snapshots = self.id_data.pose_snapshots
+        snapshot = snapshots.get(name)
+        if snapshot is None:
+            snapshot = snapshots.add()
+            snapshot.name = name
+
+        snapshot.node = self.name
+        snapshot.bone_names = '\n'.join(bone_names)
+        snapshot.data = pack(values)
+
+        return snapshot
+
+    def build_display_state(self):
+        '''(name, bone count) of pose snapshots captured by node'''
+        return tuple((snapshot.name, snapshot.bone_names.count('\n') + 1 if snapshot.bone_names else 0) for snapshot in self.id_data.pose_snapshots if snapshot.node == self.name)
+
+    def draw_display(self, context, layout, state, is_ext):
+        col = layout.column(align=True)
+        for name, bone_count in state:
+            row = col.row(align=True)
+            op = row.operator('npick.restore_pose_snapshot', text='%s (%d)' % (name, bone_count))
+            op.node_tree_name = self.id_data.name
+            op.node_object_name = self.name
+            op.snapshot_name = name
+            op = row.operator('npick.remove_pose_snapshot', text='', icon='X')
+            op.node_tree_name = self.id_data.name
+            op.snapshot_name = name
+
+        row = layout.row()
+        row.scale_y = 1.25
+        op = row.operator('npick.capture_pose_snapshot', icon='ADD')
+        op.node_tree_name = self.id_data.name
+        op.node_object_name = self.name
+
+        if len(state) > 1:
+            col = layout.column(align=True)
+            row = col.row(align=True)
+            row.prop_search(self, 'snapshot_a', self.id_data, 'pose_snapshots', text='')
+            row.prop_search(self, 'snapshot_b', self.id_data, 'pose_snapshots', text='')
+            col.prop(self, 'factor', slider=True)
+
+    def draw_label(self):
+        return "Pose Snapshot"
+
+    def to_model(self):
+        node_model = super().to_model()
+        for key in node_model.keys:
+            node_model.set_value(key, getattr(self, key))
+        return node_model
+
+    def load_model(self, node_model):
+        super().load_model(node_model)
+        for key in node_model.keys:
+            setattr(self, key, node_model.get_value(key))
+
+class NPICK_OP_capture_pose_snapshot(NPICK_OP_BASE):
+    """store local transforms of bones as pose snapshot"""
+    bl_idname = "npick.capture_pose_snapshot"
+    bl_label = "capture pose"
+
+    node_tree_name: bpy.props.StringProperty(default="", options={'HIDDEN'})
+    node_object_name: bpy.props.StringProperty(default="", options={'HIDDEN'})
+
+    name: bpy.props.StringProperty(
+        name='Name',
+        default='Pose'
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=250)
+
+    def execute(self, context):
+        # get node
+        node = bpy.data.node_groups[self.node_tree_name].nodes[self.node_object_name]
+
+        if node.object_armature is None:
+            self.report({'ERROR'}, "SELECT ARMATURE")
+            return {'CANCELLED'}
+
+        # snapshots are looked up by name, do not take over snapshot of another node
+        snapshot = node.id_data.pose_snapshots.get(self.name)
+        if snapshot is not None and snapshot.node != node.name:
+            self.report({'WARNING'}, 'pose "%s" belongs to node "%s"' % (self.name, snapshot.node))
+            return {'CANCELLED'}
+
+        snapshot = node.capture(self.name)
+
+        # first two snapshots are blend targets
+        if not node.snapshot_a:
+            node.snapshot_a = snapshot.name
+        elif not node.snapshot_b and node.snapshot_a != snapshot.name:
+            node.snapshot_b = snapshot.name
+
+        invalidate(node)
+
+        return {'FINISHED'}
+
+class NPICK_OP_restore_pose_snapshot(NPICK_OP_BASE):
+    """restore local transforms of bones from pose snapshot"""
+    bl_idname = "npick.restore_pose_snapshot"
+    bl_label = "restore pose"
+
+    node_tree_name: bpy.props.StringProperty(default="")
+    node_object_name: bpy.props.StringProperty(default="")
+    snapshot_name: bpy.props.StringProperty(default="")
+
+    def execute(self, context):
+        # get node
+        node_tree = bpy.data.node_groups[self.node_tree_name]
+        node = node_tree.nodes[self.node_object_name]
+        snapshot = node_tree.pose_snapshots.get(self.snapshot_name)
+
+        if node.object_armature is None or snapshot is None:
+            self.report({'ERROR'}, "SELECT ARMATURE")
+            return {'CANCELLED'}
+
+        apply_snapshot(node.object_armature, *get_snapshot(snapshot))
+
+        return {'FINISHED'}
+
+class NPICK_OP_remove_pose_snapshot(NPICK_OP_BASE):
+    """remove pose snapshot"""
+    bl_idname = "npick.remove_pose_snapshot"
+    bl_label = "remove pose"
+
+    node_tree_name: bpy.props.StringProperty(default="")
+    snapshot_name: bpy.props.StringProperty(default="")
+
+    def execute(self, context):
+        node_tree = bpy.data.node_groups[self.node_tree_name]
+        index = node_tree.pose_snapshots.find(self.snapshot_name)
+
+        if index < 0:
+            return {'CANCELLED'}
+
+        node_tree.pose_snapshots.remove(index)
+        invalidate(node_tree)
+
+        return {'FINISHED'}
+
+classes = [
+    NODE,
+    NPICK_OP_capture_pose_snapshot,
+    NPICK_OP_restore_pose_snapshot,
+    NPICK_OP_remove_pose_snapshot
+]
+
+def register():
+    for x in classes:
+        register_class(x)
+
+def unregister():
+    for x in reversed(classes):
+        unregister_class(x)
@@ -0,0 +1,186 @@
+import bpy
+import numpy
+from bpy.types import Operator
+from bpy.utils import register_class, unregister_class
+from .armature_cache import get_cache, get_pose_cache
+
+class NPICK_OP_BASE(Operator):
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, context):
+        return context.space_data.type == "NODE_EDITOR" and context.space_data.tree_type == "nPicker" and context.space_data.node_tree is not None
+
+# (pose bone property, array length) of local transform, in column order of pose array
+channels = (
+    ('location', 3),
+    ('rotation_quaternion', 4),
+    ('rotation_axis_angle', 4),
+    ('rotation_euler', 3),
+    ('scale', 3)
+)
+
+# columns of quaternion in pose array
+quaternion_columns = slice(3, 7)
+
+# columns per bone
+channel_width = sum(size for name, size in channels)
+
+def read_pose(object_armature):
+    '''(pose bone count, channel_width) float32 array of local transforms, one foreach_get per channel'''
+    pose_bones = object_armature.pose.bones
+    pose = numpy.zeros((len(pose_bones), channel_width), dtype=numpy.float32)
+    start = 0
+
+    for name, size in channels:
+        values = numpy.zeros(len(pose_bones) * size, dtype=numpy.float32)
+        pose_bones.foreach_get(name, values)
+        pose[:, start:start + size] = values.reshape(-1, size)
+        start += size
+
+    return pose
+
+def write_pose(object_armature, pose):
+    '''write local transforms array of every pose bone, one foreach_set per channel'''
+    pose_bones = object_armature.pose.bones
+    start = 0
+
+    for name, size in channels:
+        pose_bones.foreach_set(name, numpy.ascontiguousarray(pose[:, start:start + size]).ravel())
+        start += size
+
+    # foreach_set does not tag depsgraph
+    object_armature.update_tag()
+
+    if bpy.context.screen:
+        for area in bpy.context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+# local transform of rest pose
+identity = numpy.array([0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 1, 1], dtype=numpy.float32)
+
+# sign of columns to mirror local transform across x axis, rotation axis is flipped like a pseudo vector
+mirror_signs = numpy.array([-1, 1, 1, 1, 1, -1, -1, 1, 1, -1, -1, 1, -1, -1, 1, 1, 1], dtype=numpy.float32)
+
+def get_selected(object_armature):
+    '''(pose cache, select flags in pose bone order) of armature object'''
+    cache = get_cache(object_armature)
+    pose_cache = get_pose_cache(object_armature)
+    return pose_cache, pose_cache.get_mask(cache, cache.get_select(object_armature.data))
+
+def reset_pose(object_armature, mask):
+    '''reset local transforms of bones in mask'''
+    pose = read_pose(object_armature)
+    pose[mask] = identity
+    write_pose(object_armature, pose)
+
+def mirror_pose(object_armature, mask, pairs):
+    '''write mirrored transforms of bones in mask to opposite bones, selected pairs are swapped, center bones are flipped'''
+    pose = read_pose(object_armature)
+    sources = numpy.flatnonzero(mask)
+    # right side is evaluated first, swapped pairs read the unmodified pose
+    pose[pairs[sources]] = pose[sources] * mirror_signs
+    write_pose(object_armature, pose)
+
+def copy_pose_side(object_armature, mask, pairs, sides, side='L'):
+    '''mirror transforms of side bones in mask, or of opposite bones in mask, to the other side'''
+    # selection on either side picks the pair
+    mask = (mask | mask[pairs]) & (sides == side) & (pairs != numpy.arange(len(pairs)))
+    pose = read_pose(object_armature)
+    sources = numpy.flatnonzero(mask)
+    pose[pairs[sources]] = pose[sources] * mirror_signs
+    write_pose(object_armature, pose)
+
+    return len(sources)
+
+def get_node_armature(context, node_tree_name, node_object_name):
+    '''armature of named node from picker button, of active node from menu'''
+    if node_tree_name:
+        node = bpy.data.node_groups[node_tree_name].nodes[node_object_name]
+    else:
+        node = context.space_data.node_tree.nodes.active
+
+    return getattr(node, 'object_armature', None)
+
+class NPICK_OP_reset_pose_selection(NPICK_OP_BASE):
+    """reset location, rotation and scale of selected bones of picker armature"""
+    bl_idname = "npick.reset_pose_selection"
+    bl_label = "reset selected"
+
+    node_tree_name: bpy.props.StringProperty(default="", options={'HIDDEN'})
+    node_object_name: bpy.props.StringProperty(default="", options={'HIDDEN'})
+
+    def execute(self, context):
+        object_armature = get_node_armature(context, self.node_tree_name, self.node_object_name)
+
+        if object_armature is None:
+            self.report({'ERROR'}, "SELECT ARMATURE")
+            return {'CANCELLED'}
+
+        pose_cache, mask = get_selected(object_armature)
+        reset_pose(object_armature, mask)
+
+        return {'FINISHED'}
+
+class NPICK_OP_mirror_pose_selection(NPICK_OP_BASE):
+    """mirror pose of selected bones of picker armature to opposite side"""
+    bl_idname = "npick.mirror_pose_selection"
+    bl_label = "mirror selected"
+
+    node_tree_name: bpy.props.StringProperty(default="", options={'HIDDEN'})
+    node_object_name: bpy.props.StringProperty(default="", options={'HIDDEN'})
+
+    def execute(self, context):
+        object_armature = get_node_armature(context, self.node_tree_name, self.node_object_name)
+
+        if object_armature is None:
+            self.report({'ERROR'}, "SELECT ARMATURE")
+            return {'CANCELLED'}
+
+        pose_cache, mask = get_selected(object_armature)
+        mirror_pose(object_armature, mask, pose_cache.get_pairs())
+
+        return {'FINISHED'}
+
+class NPICK_OP_copy_pose_side(NPICK_OP_BASE):
+    """copy pose of selected bones from one side to the other side"""
+    bl_idname = "npick.copy_pose_side"
+    bl_label = "copy pose side"
+
+    node_tree_name: bpy.props.StringProperty(default="", options={'HIDDEN'})
+    node_object_name: bpy.props.StringProperty(default="", options={'HIDDEN'})
+
+    side: bpy.props.EnumProperty(
+        items=[
+            ('L', 'L -> R', 'copy left side to right side'),
+            ('R', 'R -> L', 'copy right side to left side')
+        ],
+        default='L'
+    )
+
+    def execute(self, context):
+        object_armature = get_node_armature(context, self.node_tree_name, self.node_object_name)
+
+        if object_armature is None:
+            self.report({'ERROR'}, "SELECT ARMATURE")
+            return {'CANCELLED'}
+
+        pose_cache, mask = get_selected(object_armature)
+        count = copy_pose_side(object_armature, mask, pose_cache.get_pairs(), pose_cache.get_sides(), self.side)
+        self.report({'INFO'}, "%d BONES" % count)
+
+        return {'FINISHED'}
+
+classes = [
+    NPICK_OP_reset_pose_selection,
+    NPICK_OP_mirror_pose_selection,
+    NPICK_OP_copy_pose_side
+]
+
+def register():
+    for x in classes:
+        register_class(x)
+
+def unregister():
+    for x in reversed(classes):
+        unregister_class(x)
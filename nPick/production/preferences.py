@@ -0,0 +1,41 @@
+import bpy
+from bpy.types import AddonPreferences
+from bpy.utils import register_class, unregister_class
+
+class NPICK_addon_preferences(AddonPreferences):
+    bl_idname = __name__.partition('.')[0]
+
+    lazy_register: bpy.props.BoolProperty(
+        name='Lazy Register',
+        description='register nodes and operators when nPicker tree is first used instead of when addon is enabled',
+        default=True
+    )
+
+    show_debug_panel: bpy.props.BoolProperty(
+        name='Show Debug Panel',
+        description='show display state cache hit rates in node editor sidebar',
+        default=False
+    )
+
+    def draw(self, context):
+        layout = self.layout
+
+        layout.prop(self, 'lazy_register')
+        layout.prop(self, 'show_debug_panel')
+
+classes = [
+    NPICK_addon_preferences
+]
+
+def get_preferences(context):
+    '''get addon preferences, None when addon is not enabled through preferences'''
+    addon = context.preferences.addons.get(NPICK_addon_preferences.bl_idname)
+    return addon.preferences if addon else None
+
+def register():
+    for x in classes:
+        register_class(x)
+
+def unregister():
+    for x in reversed(classes):
+        unregister_class(x)
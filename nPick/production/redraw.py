@@ -0,0 +1,163 @@
+import bpy
+import numpy
+from bpy.app.handlers import persistent
+from .armature_cache import get_bone_state, update_caches
+from .draw_cache import invalidate_watched
+
+# node tree pointers waiting for redraw, flushed once per event loop
+pending = set()
+
+# node tree pointer to (msgbus owner, set of subscribed key ids)
+subscriptions = {}
+
+# datablock pointer to {node tree pointer: redraw only when bone state of armature data changed}
+watchers = {}
+
+# armature data pointer to last seen (select flags, hidden flags, active bone name)
+states = {}
+
+def tag_redraw(tree_pointers):
+    '''redraw nPicker areas that show any of node trees now'''
+    window_manager = bpy.context.window_manager
+
+    if window_manager is None:
+        return
+
+    for window in window_manager.windows:
+        for area in window.screen.areas:
+            if area.type != 'NODE_EDITOR':
+                continue
+
+            space = area.spaces.active
+            if space.tree_type == 'nPicker' and space.node_tree is not None and space.node_tree.as_pointer() in tree_pointers:
+                area.tag_redraw()
+
+def flush():
+    '''timer callback, redraw all requested node trees in one pass'''
+    if pending:
+        tag_redraw(set(pending))
+        pending.clear()
+
+    return None
+
+def request_redraw(tree_pointers):
+    '''schedule redraw of node trees, requests in the same event loop are coalesced'''
+    pending.update(tree_pointers)
+
+    if pending and not bpy.app.timers.is_registered(flush):
+        bpy.app.timers.register(flush, first_interval=0.0)
+
+def notify(tree_pointer):
+    request_redraw((tree_pointer,))
+
+def subscribe(node, data, name):
+    '''redraw node tree when rna property data.name changes, subscribed once per tree'''
+    tree_pointer = node.id_data.as_pointer()
+    subscription = subscriptions.get(tree_pointer)
+
+    if subscription is None:
+        subscription = subscriptions[tree_pointer] = (object(), set())
+
+    owner, key_ids = subscription
+    key_id = (data.as_pointer(), name)
+
+    if key_id in key_ids:
+        return
+
+    key_ids.add(key_id)
+    bpy.msgbus.subscribe_rna(
+        key=data.path_resolve(name, False),
+        owner=owner,
+        args=(tree_pointer,),
+        notify=notify
+    )
+
+def watch(node, datablock, is_bone_state=False):
+    '''redraw node tree when datablock is updated, for data msgbus can not subscribe to like custom properties,
+    is_bone_state redraws only when select, hidden or active bone of armature data changed'''
+    tree_pointers = watchers.setdefault(datablock.as_pointer(), {})
+    tree_pointer = node.id_data.as_pointer()
+    tree_pointers[tree_pointer] = tree_pointers.get(tree_pointer, True) and is_bone_state
+
+def is_bone_state_changed(armature):
+    '''diff bone state with last seen state, store new state'''
+    key = armature.as_pointer()
+    cache, select, hidden, active = get_bone_state(armature)
+    state = states.get(key)
+
+    if state is not None and state[2] == active and numpy.array_equal(state[0], select) and numpy.array_equal(state[1], hidden):
+        return False
+
+    states[key] = (select.copy(), hidden.copy(), active)
+    return True
+
+def get_watching(datablock):
+    '''node tree pointers to redraw after datablock was updated'''
+    tree_pointers = watchers.get(datablock.as_pointer())
+
+    if not tree_pointers:
+        return ()
+
+    # bone state is diffed only when a tree waits for it, other updates of armature data do not redraw picker
+    if isinstance(datablock, bpy.types.Armature) and any(tree_pointers.values()) and not is_bone_state_changed(datablock):
+        return [tree_pointer for tree_pointer, is_bone_state in tree_pointers.items() if not is_bone_state]
+
+    return tree_pointers.keys()
+
+def notify_bone_state(armature):
+    '''bone state written by picker, foreach_set sends no update so refresh watching trees here'''
+    invalidate_watched({armature.as_pointer()})
+    request_redraw(get_watching(armature))
+
+def clear_subscriptions():
+    for owner, key_ids in subscriptions.values():
+        bpy.msgbus.clear_by_owner(owner)
+
+    subscriptions.clear()
+    watchers.clear()
+    states.clear()
+    pending.clear()
+
+@persistent
+def depsgraph_update_post(scene, depsgraph):
+    '''only depsgraph handler of nPick, caches are updated before bone state is diffed and redraw is scheduled'''
+    updates = list(depsgraph.updates)
+
+    update_caches(updates)
+    invalidate_watched({update.id.original.as_pointer() for update in updates})
+
+    if not watchers:
+        return
+
+    tree_pointers = set()
+    for update in updates:
+        tree_pointers.update(get_watching(update.id.original))
+
+    if tree_pointers:
+        request_redraw(tree_pointers)
+
+@persistent
+def clear_subscriptions_handler(dummy):
+    # pointers in subscription keys are not valid after undo or load
+    clear_subscriptions()
+
+handlers = [
+    (bpy.app.handlers.depsgraph_update_post, depsgraph_update_post),
+    (bpy.app.handlers.undo_post, clear_subscriptions_handler),
+    (bpy.app.handlers.redo_post, clear_subscriptions_handler),
+    (bpy.app.handlers.load_post, clear_subscriptions_handler)
+]
+
+def register():
+    for handler_list, handler in handlers:
+        handler_list.append(handler)
+
+def unregister():
+    for handler_list, handler in reversed(handlers):
+        if handler in handler_list:
+            handler_list.remove(handler)
+
+    if bpy.app.timers.is_registered(flush):
+        bpy.app.timers.unregister(flush)
+
+    clear_subscriptions()
@@ -0,0 +1,82 @@
+import bpy
+import numpy
+from .armature_cache import get_cache
+from .redraw import notify_bone_state
+
+# selection modes
+SET = 'SET'
+ADD = 'ADD'
+SUBTRACT = 'SUBTRACT'
+TOGGLE = 'TOGGLE'
+INTERSECT = 'INTERSECT'
+
+selection_modes = [
+    (SET, 'Set', 'select exactly these bones'),
+    (ADD, 'Add', 'add bones to selection'),
+    (SUBTRACT, 'Subtract', 'remove bones from selection'),
+    (TOGGLE, 'Toggle', 'toggle selection of bones'),
+    (INTERSECT, 'Intersect', 'keep only selected bones that are also in these bones')
+]
+
+def get_mask(object_armature, bone_names):
+    '''boolean mask of bones from names, unknown names are ignored'''
+    bone_names = list(bone_names)
+    cache = get_cache(object_armature)
+
+    # rebuild stale cache once, e.g. after rename
+    missing_name = next((bone_name for bone_name in bone_names if bone_name not in cache.indices), None)
+    if missing_name:
+        cache = get_cache(object_armature, missing_name)
+
+    mask = numpy.zeros(len(cache.names), dtype=bool)
+    mask[[cache.indices[bone_name] for bone_name in bone_names if bone_name in cache.indices]] = True
+
+    return mask
+
+def apply_mask(object_armature, mask, mode=SET):
+    '''apply boolean mask of bones to selection in one write'''
+    armature = object_armature.data
+    cache = get_cache(object_armature)
+
+    if mode == SET:
+        select = mask.copy()
+    else:
+        select = cache.get_select(armature)
+
+        if mode == ADD:
+            select = select | mask
+        elif mode == SUBTRACT:
+            select = select & ~mask
+        elif mode == TOGGLE:
+            select = select ^ mask
+        elif mode == INTERSECT:
+            select = select & mask
+        else:
+            raise ValueError('unknown selection mode ' + mode)
+
+    cache.set_select(armature, select)
+
+    # foreach_set does not tag depsgraph, evaluated armature keeps old selection otherwise
+    armature.update_tag()
+    notify_bone_state(armature)
+
+    # foreach_set does not send notifier, redraw view 3d to show new selection
+    if bpy.context.screen:
+        for area in bpy.context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+def mask_to_bitset(mask):
+    '''hex string of boolean mask, bit n is bone index n'''
+    return numpy.packbits(mask, bitorder='little').tobytes().hex()
+
+def bitset_to_mask(bitset, size):
+    '''boolean mask of size bones from hex string'''
+    bits = numpy.unpackbits(numpy.frombuffer(bytes.fromhex(bitset), dtype=numpy.uint8), bitorder='little')
+    mask = numpy.zeros(size, dtype=bool)
+    mask[:min(size, len(bits))] = bits[:size]
+    return mask
+
+def select_bones(object_armature, bone_names, mode=SET):
+    '''apply bones from names to selection in one write'''
+    apply_mask(object_armature, get_mask(object_armature, bone_names), mode)
@@ -0,0 +1,184 @@
+import bpy
+from bpy.types import Operator
+from bpy.utils import register_class, unregister_class
+from .armature_cache import get_cache
+from .selection import SET, selection_modes, apply_mask, mask_to_bitset, bitset_to_mask
+from .redraw import request_redraw
+
+class NPICK_OP_BASE(Operator):
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, context):
+        return context.space_data.type == "NODE_EDITOR" and context.space_data.tree_type == "nPicker" and context.space_data.node_tree is not None
+
+def get_object_armature(node_tree, selection_set):
+    '''armature object of selection set binding, None when binding is missing or empty'''
+    binding = node_tree.armature_bindings.get(selection_set.binding)
+    return binding.object_armature if binding is not None else None
+
+def store_selection_set(selection_set, object_armature):
+    '''store selected bones of armature to selection set in one read'''
+    armature = object_armature.data
+    cache = get_cache(object_armature)
+    selection_set.bitset = mask_to_bitset(cache.get_select(armature))
+    selection_set.bone_count = len(cache.names)
+    selection_set.names_hash = cache.names_hash
+
+def apply_selection_set(node_tree, name, mode=SET, object_armatures=None):
+    '''apply selection set of node tree in one write per armature, armature of set binding when object_armatures is None, return error text or None'''
+    selection_set = node_tree.selection_sets.get(name)
+
+    if selection_set is None:
+        return 'selection set "%s" not found' % name
+
+    if not object_armatures:
+        object_armature = get_object_armature(node_tree, selection_set)
+
+        if object_armature is None:
+            return 'selection set "%s" has no armature' % name
+
+        object_armatures = [object_armature]
+
+    # bits are bone indices, every armature is checked before any is written
+    for object_armature in object_armatures:
+        cache = get_cache(object_armature)
+
+        if len(cache.names) != selection_set.bone_count:
+            return 'selection set "%s" is out of date, armature "%s" has %d bones, set has %d' % (name, object_armature.name, len(cache.names), selection_set.bone_count)
+
+        # same count after rename, reorder or delete and add selects wrong bones
+        if selection_set.names_hash and selection_set.names_hash != cache.names_hash:
+            return 'selection set "%s" is out of date, bones of armature "%s" were renamed or reordered' % (name, object_armature.name)
+
+    mask = bitset_to_mask(selection_set.bitset, selection_set.bone_count)
+
+    for object_armature in object_armatures:
+        apply_mask(object_armature, mask, mode)
+
+class NPICK_OP_add_selection_set(NPICK_OP_BASE):
+    """store selected bones as selection set of node tree"""
+    bl_idname = "npick.add_selection_set"
+    bl_label = "add selection set"
+
+    name: bpy.props.StringProperty(
+        name='Name',
+        default='Set'
+    )
+
+    binding: bpy.props.StringProperty(
+        name='Armature',
+        default=''
+    )
+
+    def invoke(self, context, event):
+        node_tree = context.space_data.node_tree
+
+        # binding of active armature, first binding otherwise
+        bindings = node_tree.armature_bindings
+        binding = next((binding for binding in bindings if binding.object_armature is not None and binding.object_armature == context.object), None)
+        if binding is None and bindings:
+            binding = bindings[0]
+        self.binding = binding.name if binding else ''
+
+        return context.window_manager.invoke_props_dialog(self, width=250)
+
+    def draw(self, context):
+        col = self.layout.column()
+        col.prop(self, 'name')
+        col.prop_search(self, 'binding', context.space_data.node_tree, 'armature_bindings')
+
+    def execute(self, context):
+        node_tree = context.space_data.node_tree
+        binding = node_tree.armature_bindings.get(self.binding)
+
+        if binding is None or binding.object_armature is None:
+            self.report({'ERROR'}, "SELECT ARMATURE")
+            return {'CANCELLED'}
+
+        selection_set = node_tree.selection_sets.get(self.name)
+        if selection_set is None:
+            selection_set = node_tree.selection_sets.add()
+            selection_set.name = self.name
+
+        selection_set.binding = binding.name
+        store_selection_set(selection_set, binding.object_armature)
+
+        return {'FINISHED'}
+
+class NPICK_OP_update_selection_set(NPICK_OP_BASE):
+    """store selected bones to selection set"""
+    bl_idname = "npick.update_selection_set"
+    bl_label = "update selection set"
+
+    index: bpy.props.IntProperty(default=-1)
+
+    def execute(self, context):
+        node_tree = context.space_data.node_tree
+
+        if not 0 <= self.index < len(node_tree.selection_sets):
+            return {'CANCELLED'}
+
+        selection_set = node_tree.selection_sets[self.index]
+        object_armature = get_object_armature(node_tree, selection_set)
+
+        if object_armature is None:
+            self.report({'ERROR'}, "SELECT ARMATURE")
+            return {'CANCELLED'}
+
+        store_selection_set(selection_set, object_armature)
+
+        return {'FINISHED'}
+
+class NPICK_OP_remove_selection_set(NPICK_OP_BASE):
+    """remove selection set from node tree"""
+    bl_idname = "npick.remove_selection_set"
+    bl_label = "remove selection set"
+
+    index: bpy.props.IntProperty(default=-1)
+
+    def execute(self, context):
+        node_tree = context.space_data.node_tree
+
+        if not 0 <= self.index < len(node_tree.selection_sets):
+            return {'CANCELLED'}
+
+        node_tree.selection_sets.remove(self.index)
+        request_redraw((node_tree.as_pointer(),))
+
+        return {'FINISHED'}
+
+class NPICK_OP_apply_selection_set(NPICK_OP_BASE):
+    """select bones of selection set"""
+    bl_idname = "npick.apply_selection_set"
+    bl_label = "apply selection set"
+
+    name: bpy.props.StringProperty(default='')
+
+    mode: bpy.props.EnumProperty(
+        items=selection_modes,
+        default=SET
+    )
+
+    def execute(self, context):
+        error = apply_selection_set(context.space_data.node_tree, self.name, self.mode)
+
+        if error:
+            self.report({'ERROR'}, error)
+            return {'CANCELLED'}
+
+        return {'FINISHED'}
+
+classes = [
+    NPICK_OP_add_selection_set,
+    NPICK_OP_update_selection_set,
+    NPICK_OP_remove_selection_set,
+    NPICK_OP_apply_selection_set
+]
+
+def register():
+    for x in classes:
+        register_class(x)
+
+def unregister():
+    for x in reversed(classes):
+        unregister_class(x)
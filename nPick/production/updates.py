@@ -0,0 +1,18 @@
+from contextlib import contextmanager
+
+# depth of nested suppress_updates blocks
+suppress_depth = 0
+
+@contextmanager
+def suppress_updates():
+    '''skip nPick property update callbacks inside the block, caller updates once after'''
+    global suppress_depth
+
+    suppress_depth += 1
+    try:
+        yield
+    finally:
+        suppress_depth -= 1
+
+def is_suppressed():
+    return suppress_depth > 0